@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -56,6 +57,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -90,6 +92,43 @@ DATABASES = {
     }
 }
 
+# SQLite production profile (SQLITE_PRODUCTION=1). WAL lets readers run
+# alongside the single writer, IMMEDIATE transactions take the write lock
+# up front so concurrent writers queue on busy_timeout instead of failing
+# with "database is locked", and connections are kept between requests.
+# Compare with: python3 manage.py benchmark_sqlite
+SQLITE_PRODUCTION_INIT_COMMAND = (
+    'PRAGMA journal_mode=WAL;'
+    'PRAGMA synchronous=NORMAL;'
+    'PRAGMA busy_timeout=10000;'
+    'PRAGMA cache_size=-32000;'
+    'PRAGMA mmap_size=268435456;'
+    'PRAGMA temp_store=MEMORY;'
+)
+if os.environ.get('SQLITE_PRODUCTION') == '1':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': SQLITE_PRODUCTION_INIT_COMMAND,
+            'transaction_mode': 'IMMEDIATE',
+        },
+    })
+
+# Optional read replica. Safe-method API requests read from it, except for
+# READ_YOUR_WRITES_SECONDS after the same user wrote something. Locally it
+# can be a second SQLite file kept current with
+#   python3 manage.py sync_replica --interval 5
+READ_REPLICA_DB = os.environ.get('READ_REPLICA_DB')
+if READ_REPLICA_DB:
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': READ_REPLICA_DB,
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+READ_YOUR_WRITES_SECONDS = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -133,18 +172,86 @@ AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Builds request.user from the access token's claims, without a query.
+        'core.auth.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Opt-in: only requests with ?page_size= or ?cursor= are paginated.
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
 }
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_OBTAIN_SERIALIZER': 'core.auth.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'core.auth.ClaimsTokenRefreshSerializer',
+    'TOKEN_USER_CLASS': 'core.auth.ClaimsUser',
 }
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+# Server-side grading (``?grading=auto`` on results/bulk_create/ and
+# results/exam/<id>/regrade/) uses core.grading.DEFAULT_GRADING_SCALE. To
+# override it, set GRADING_SCALE to (minimum percentage, grade) pairs,
+# highest band first.
+
+# First day of the current term for attendance rollups (YYYY-MM-DD).
+# When unset, the term starts on January 1st of the current year.
+ATTENDANCE_TERM_START = None
+
+# Exam statistics count a pass from core.grading.DEFAULT_PASS_PERCENTAGE;
+# set PASS_PERCENTAGE to override it.
+
+# Process-local cache, no outside service needed. Cached listings are keyed
+# by database version counters, so each process stays correct on its own;
+# switch to django.core.cache.backends.filebased.FileBasedCache to share
+# entries between worker processes on one host.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'school-management',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+}
+
+# Rows validated and written per transaction by the student/parent import.
+IMPORT_CHUNK_SIZE = 500
+# Processes hashing passwords for import_records and provision_accounts
+# (None: one per CPU). The API import hashes in the request's process.
+# Compare with: python3 manage.py benchmark_provisioning
+PASSWORD_HASH_WORKERS = None
+
+# Seconds a cached class, exam or meeting listing is kept.
+RESPONSE_CACHE_TIMEOUT = 5 * 60
+
+# Concurrent attendance and result submissions arriving within this many
+# milliseconds are written in one transaction (0 writes each on its own).
+# A batch closes early once WRITE_COALESCE_MAX_BATCH submissions are queued.
+# Off by default: the first submission of a batch always waits the full
+# window, which only pays off with threaded workers (e.g. gunicorn
+# --threads 8) under concurrent writes. Try 5.
+WRITE_COALESCE_WINDOW_MS = 0
+WRITE_COALESCE_MAX_BATCH = 50
+
+# Seconds an exam's statistics stay cached; result writes for the exam drop
+# the entry straight away.
+EXAM_STATS_CACHE_TIMEOUT = 60 * 60
+
+# Notification fan-out runs from the outbox worker:
+#   python3 manage.py process_notification_outbox --loop
+# With NOTIFICATION_OUTBOX_EAGER the request also expands its own event
+# right after committing, so development needs no worker process.
+NOTIFICATION_OUTBOX_EAGER = DEBUG
+NOTIFICATION_OUTBOX_BATCH_SIZE = 500
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = 5
+# Days within which a parent is not notified twice about the same absence,
+# result or meeting.
+NOTIFICATION_DEDUP_WINDOW_DAYS = 60
+# Read notifications older than this many days are moved to the archive by
+#   python3 manage.py archive_notifications
+# (never sooner than the dedup window above).
+NOTIFICATION_RETENTION_DAYS = 90
+NOTIFICATION_ARCHIVE_BATCH_SIZE = 1000
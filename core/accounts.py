@@ -0,0 +1,109 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.db import transaction
+
+from .models import ParentProfile, User
+from .versions import PARENTS, bump
+
+
+def _encode(job):
+    hasher, password, salt = job
+    return hasher.encode(password, salt)
+
+
+@contextmanager
+def password_hashing_pool(workers=None):
+    """A process pool for ``hash_passwords``, or ``None`` with one worker.
+
+    ``workers`` defaults to ``PASSWORD_HASH_WORKERS`` or the CPU count.
+    Open one pool per run and pass it to every ``hash_passwords`` call.
+    The pool forks this process, so only use it from management commands
+    and scripts, never inside a request on a threaded server.
+    """
+    workers = workers or getattr(settings, "PASSWORD_HASH_WORKERS", None) or os.cpu_count() or 1
+    if workers <= 1:
+        yield None
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield pool
+
+
+def hash_passwords(passwords, pool=None):
+    """Hash ``passwords`` like ``make_password``, spread over ``pool``.
+
+    Blank passwords become unusable ones. The hasher and salts are chosen
+    here and shipped to the workers, so they need no Django setup of their
+    own. Without a pool (see ``password_hashing_pool``), or with a single
+    password, everything is hashed in this process.
+    """
+    hasher = get_hasher()
+    encoded = [None] * len(passwords)
+    indexes, jobs = [], []
+    for index, password in enumerate(passwords):
+        if password:
+            indexes.append(index)
+            jobs.append((hasher, password, hasher.salt()))
+        else:
+            encoded[index] = make_password(None)
+
+    if pool is not None and len(jobs) > 1:
+        hashed = list(pool.map(_encode, jobs))
+    else:
+        hashed = [_encode(job) for job in jobs]
+    for index, value in zip(indexes, hashed):
+        encoded[index] = value
+    return encoded
+
+
+def create_accounts(accounts, role):
+    """Insert users from ``accounts`` dicts whose ``password`` is already hashed.
+
+    Each dict has ``username`` and optionally ``first_name``, ``last_name``,
+    ``email`` and ``role`` (defaulting to ``role``). Parents also get their
+    ``ParentProfile`` from ``phone``/``address``. Two ``bulk_create`` calls
+    in all; usernames must already be checked as free. Returns the users.
+    """
+    users = [
+        User(
+            username=account["username"],
+            first_name=account.get("first_name", ""),
+            last_name=account.get("last_name", ""),
+            email=User.objects.normalize_email(account.get("email", "")),
+            password=account["password"],
+            role=account.get("role") or role,
+        )
+        for account in accounts
+    ]
+    User.objects.bulk_create(users)
+    if any(user.pk is None for user in users):
+        ids = dict(User.objects.filter(username__in=[user.username for user in users]).values_list("username", "pk"))
+        for user in users:
+            user.pk = ids[user.username]
+
+    profiles = [
+        ParentProfile(user_id=user.pk, phone=account.get("phone", ""), address=account.get("address", ""))
+        for user, account in zip(users, accounts)
+        if user.role == User.Roles.PARENT
+    ]
+    if profiles:
+        ParentProfile.objects.bulk_create(profiles)
+        bump(PARENTS)
+    return users
+
+
+def provision_accounts(accounts, role, workers=None):
+    """Create accounts from plain-text ``password`` values in bulk.
+
+    Passwords are hashed in parallel before the transaction opens, so the
+    write lock is not held while hashing. Like ``password_hashing_pool``,
+    not for use under threaded web workers.
+    """
+    with password_hashing_pool(workers) as pool:
+        passwords = hash_passwords([account.get("password") for account in accounts], pool)
+    accounts = [dict(account, password=password) for account, password in zip(accounts, passwords)]
+    with transaction.atomic():
+        return create_accounts(accounts, role)
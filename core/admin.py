@@ -1,15 +1,21 @@
 from django.contrib import admin
+from django.db import transaction
 
+from .bulk import move_student_records
 from .models import (
     User,
     ClassRoom,
     ParentProfile,
     Student,
+    StudentAttendanceRollup,
     Attendance,
+    ClassAttendanceSummary,
     Exam,
     Result,
     Meeting,
+    ArchivedNotification,
     Notification,
+    NotificationOutbox,
 )
 
 
@@ -38,11 +44,30 @@ class StudentAdmin(admin.ModelAdmin):
     search_fields = ("name", "roll_number")
     list_filter = ("classroom",)
 
+    @transaction.atomic
+    def save_model(self, request, obj, form, change):
+        previous_classroom_id = form.initial.get("classroom") if change else None
+        super().save_model(request, obj, form, change)
+        if change:
+            move_student_records(obj, previous_classroom_id)
+
 
 @admin.register(Attendance)
 class AttendanceAdmin(admin.ModelAdmin):
     list_display = ("student", "date", "status", "marked_by")
-    list_filter = ("status", "date", "student__classroom")
+    list_filter = ("status", "date", "classroom")
+
+
+@admin.register(ClassAttendanceSummary)
+class ClassAttendanceSummaryAdmin(admin.ModelAdmin):
+    list_display = ("classroom", "date", "present", "absent", "late")
+    list_filter = ("date", "classroom")
+
+
+@admin.register(StudentAttendanceRollup)
+class StudentAttendanceRollupAdmin(admin.ModelAdmin):
+    list_display = ("student", "present", "absent", "late", "current_absence_streak", "last_absent_date")
+    search_fields = ("student__name", "student__roll_number")
 
 
 @admin.register(Exam)
@@ -68,3 +93,14 @@ class NotificationAdmin(admin.ModelAdmin):
     list_display = ("parent", "type", "title", "date", "is_read")
     list_filter = ("type", "is_read", "date")
 
+
+@admin.register(ArchivedNotification)
+class ArchivedNotificationAdmin(admin.ModelAdmin):
+    list_display = ("parent", "type", "title", "date", "archived_at")
+    list_filter = ("type",)
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "state", "attempts", "notifications_created", "created_at", "processed_at")
+    list_filter = ("kind", "state")
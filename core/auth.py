@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import ParentProfile
+
+
+User = get_user_model()
+
+
+def add_claims(token, user):
+    """Copy what permission checks and parent scoping need into ``token``."""
+    token["username"] = user.username
+    token["role"] = user.role
+    token["is_superuser"] = user.is_superuser
+    token["parent_profile_id"] = (
+        ParentProfile.objects.filter(user_id=user.pk).values_list("pk", flat=True).first()
+        if user.role == User.Roles.PARENT
+        else None
+    )
+    return token
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Issue the new access token with claims read from the current user row.
+
+    Without this a role change would only reach tokens when the refresh
+    token expires. Refresh token rotation is not enabled here and not
+    supported.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.payload.get(api_settings.USER_ID_CLAIM)}
+        ).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+        return {"access": str(add_claims(refresh.access_token, user))}
+
+
+class ClaimsUser(TokenUser):
+    """The requesting user as described by their access token's claims.
+
+    Enough for permission checks and for filtering by ``pk``, ``role`` or
+    ``parent_profile_id``. ``user`` and ``parent_profile`` load the rows on
+    first use for the few views that need them.
+    """
+
+    @cached_property
+    def role(self):
+        return self.token["role"]
+
+    @cached_property
+    def parent_profile_id(self):
+        return self.token.get("parent_profile_id")
+
+    @cached_property
+    def user(self):
+        return User.objects.get(pk=self.pk)
+
+    @cached_property
+    def parent_profile(self):
+        if self.parent_profile_id is None:
+            return None
+        return ParentProfile.objects.filter(pk=self.parent_profile_id).first()
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """JWT authentication that trusts the token's claims instead of loading the user.
+
+    Saves the ``User`` query on every request. Tokens issued before role
+    claims existed fall back to the database lookup until they expire.
+    """
+
+    def get_user(self, validated_token):
+        if "role" not in validated_token:
+            return JWTAuthentication.get_user(self, validated_token)
+        return ClaimsUser(validated_token)
+
+
+def parent_profile_id_for(user):
+    """The requesting parent's ``ParentProfile`` id, from the token when possible."""
+    if isinstance(user, ClaimsUser):
+        return user.parent_profile_id
+    return ParentProfile.objects.filter(user_id=user.pk).values_list("pk", flat=True).first()
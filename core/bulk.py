@@ -0,0 +1,120 @@
+from .grading import get_grading_scale, grade_expression, grade_for
+from .models import Attendance, Result
+from .ranking import refresh_exam_ranks
+from .rollups import refresh_class_summaries
+
+
+def upsert_attendance(items, marked_by_id):
+    """Insert or update one attendance row per ``(student, date)`` in ``items``.
+
+    The whole payload is written with a single ``INSERT ... ON CONFLICT DO
+    UPDATE`` (split into batches only when it exceeds the backend's parameter
+    limit) and read back with one query, so the statement count does not
+    grow with the number of rows. Returns the saved records in input order.
+    """
+    latest = {}
+    for item in items:
+        # Later rows for the same student/date win, as they did with the
+        # row-by-row update_or_create loop.
+        latest[(item["student"].pk, item["date"])] = item
+
+    rows = [
+        Attendance(
+            student=item["student"],
+            classroom_id=item["student"].classroom_id,
+            date=item["date"],
+            status=item["status"],
+            marked_by_id=marked_by_id,
+        )
+        for item in latest.values()
+    ]
+    Attendance.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["student", "date"],
+        update_fields=["classroom", "status", "marked_by"],
+    )
+
+    # Conflicting rows keep their original created_at, so read the stored
+    # values back rather than trusting the in-memory instances.
+    saved = Attendance.objects.select_related(
+        "student", "student__classroom", "student__parent__user"
+    ).in_bulk([row.pk for row in rows])
+    by_key = {(record.student_id, record.date): record for record in saved.values()}
+    return [by_key[(item["student"].pk, item["date"])] for item in items]
+
+
+def upsert_results(items, created_by_id, auto_grade=False):
+    """Insert or update one result per ``(exam, student)`` in ``items``.
+
+    Works like ``upsert_attendance``. With ``auto_grade`` the grade is
+    computed from ``marks / total_marks`` using the configured grading scale
+    instead of being taken from the payload.
+    """
+    scale = get_grading_scale() if auto_grade else None
+    latest = {}
+    for item in items:
+        latest[(item["exam"].pk, item["student"].pk)] = item
+
+    rows = [
+        Result(
+            exam=item["exam"],
+            student=item["student"],
+            classroom_id=item["student"].classroom_id,
+            marks=item["marks"],
+            total_marks=item["total_marks"],
+            grade=(
+                grade_for(item["marks"], item["total_marks"], scale)
+                if auto_grade
+                else item["grade"]
+            ),
+            remarks=item.get("remarks", ""),
+            created_by_id=created_by_id,
+        )
+        for item in latest.values()
+    ]
+    Result.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["exam", "student"],
+        update_fields=["classroom", "marks", "total_marks", "grade", "remarks", "created_by"],
+    )
+
+    saved = Result.objects.select_related(
+        "exam",
+        "exam__classroom",
+        "student",
+        "student__classroom",
+        "student__parent__user",
+    ).in_bulk([row.pk for row in rows])
+    by_key = {(record.exam_id, record.student_id): record for record in saved.values()}
+    return [by_key[(item["exam"].pk, item["student"].pk)] for item in items]
+
+
+def regrade_exam(exam_id, scale=None):
+    """Recompute every grade for ``exam_id`` with one ``UPDATE``.
+
+    Returns the number of results updated.
+    """
+    return Result.objects.filter(exam_id=exam_id).update(grade=grade_expression(scale))
+
+
+def move_student_records(student, previous_classroom_id):
+    """Re-point a student's attendance and results after a class change.
+
+    Updates the denormalized ``classroom`` on both tables with one
+    ``UPDATE`` each, then refreshes the class summaries of both classrooms
+    and the ranks of the student's exams.
+    """
+    if student.classroom_id == previous_classroom_id:
+        return
+    attendance = Attendance.objects.filter(student_id=student.pk)
+    dates = set(attendance.values_list("date", flat=True))
+    attendance.update(classroom_id=student.classroom_id)
+    results = Result.objects.filter(student_id=student.pk)
+    exam_ids = set(results.values_list("exam_id", flat=True))
+    results.update(classroom_id=student.classroom_id)
+    refresh_class_summaries(
+        {(classroom_id, date) for classroom_id in (previous_classroom_id, student.classroom_id) for date in dates}
+    )
+    refresh_exam_ranks(exam_ids)
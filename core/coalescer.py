@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+
+
+# Coalescers by name; filled in as they are created.
+COALESCERS = {}
+
+
+class _Job:
+    __slots__ = ("fn", "submitted", "done", "result", "error")
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.submitted = time.monotonic()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class WriteCoalescer:
+    """Group concurrent writes from request threads into one transaction.
+
+    The first caller to arrive becomes the leader: it waits up to
+    ``WRITE_COALESCE_WINDOW_MS`` (or until ``WRITE_COALESCE_MAX_BATCH`` jobs
+    are queued) for other callers, then runs every queued job in a single
+    transaction, each in its own savepoint. A job that raises only rolls
+    back its savepoint and the exception is re-raised in its own caller;
+    the others still commit. Batches run one at a time per process, and
+    callers arriving meanwhile form the next batch.
+
+    Jobs run on the leader's thread and database connection, so they must
+    only close over plain values, not the caller's connection state. When
+    the caller is already inside ``atomic()`` or the window is 0 the job
+    simply runs inline in its own ``atomic()`` block.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._pending = []
+        self._leader = None
+        self.reset_stats()
+        COALESCERS[name] = self
+
+    def submit(self, fn):
+        window = getattr(settings, "WRITE_COALESCE_WINDOW_MS", 0) / 1000
+        if window <= 0 or connection.in_atomic_block:
+            with transaction.atomic():
+                return fn()
+
+        job = _Job(fn)
+        with self._lock:
+            self._pending.append(job)
+            leader = self._leader is None
+            if leader:
+                self._leader = threading.Event()
+            elif len(self._pending) >= getattr(settings, "WRITE_COALESCE_MAX_BATCH", 50):
+                self._leader.set()
+            full = self._leader
+        if leader:
+            full.wait(window)
+            self._run_batch()
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def _run_batch(self):
+        with self._run_lock:
+            with self._lock:
+                batch, self._pending, self._leader = self._pending, [], None
+            started = time.monotonic()
+            locked = started
+            try:
+                # Under SQLITE_PRODUCTION the write lock is taken by BEGIN
+                # IMMEDIATE here, so this measures the wait for it.
+                with transaction.atomic():
+                    locked = time.monotonic()
+                    for job in batch:
+                        try:
+                            with transaction.atomic():
+                                job.result = job.fn()
+                        except Exception as exc:  # noqa: BLE001 - handed back to the caller
+                            job.error = exc
+            except Exception as exc:  # noqa: BLE001 - the commit failed for everyone
+                for job in batch:
+                    if job.error is None:
+                        job.result, job.error = None, exc
+            finally:
+                self._record(batch, started, locked)
+                for job in batch:
+                    job.done.set()
+
+    def _record(self, batch, started, locked):
+        waits = [(started - job.submitted) * 1000 for job in batch]
+        lock_wait = (locked - started) * 1000
+        with self._lock:
+            stats = self._stats
+            stats["batches"] += 1
+            stats["jobs"] += len(batch)
+            stats["failed"] += sum(job.error is not None for job in batch)
+            stats["batch_sizes"][len(batch)] += 1
+            stats["queue_wait_ms"] += sum(waits)
+            stats["max_queue_wait_ms"] = max(stats["max_queue_wait_ms"], *waits)
+            stats["lock_wait_ms"] += lock_wait
+            stats["max_lock_wait_ms"] = max(stats["max_lock_wait_ms"], lock_wait)
+
+    def stats(self):
+        """Batch and wait counters of this process since the last reset.
+
+        ``queue_wait`` is per caller, from submitting until its batch
+        started; ``lock_wait`` is per batch, opening the transaction.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            sizes = stats.pop("batch_sizes")
+        batches, jobs = stats["batches"], stats["jobs"]
+        stats.update(
+            mean_batch_size=round(jobs / batches, 2) if batches else None,
+            max_batch_size=max(sizes, default=0),
+            batch_sizes={str(size): count for size, count in sorted(sizes.items())},
+            queue_wait_ms=round(stats["queue_wait_ms"], 2),
+            mean_queue_wait_ms=round(stats["queue_wait_ms"] / jobs, 2) if jobs else None,
+            max_queue_wait_ms=round(stats["max_queue_wait_ms"], 2),
+            lock_wait_ms=round(stats["lock_wait_ms"], 2),
+            mean_lock_wait_ms=round(stats["lock_wait_ms"] / batches, 2) if batches else None,
+            max_lock_wait_ms=round(stats["max_lock_wait_ms"], 2),
+        )
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {
+                "batches": 0,
+                "jobs": 0,
+                "failed": 0,
+                "batch_sizes": Counter(),
+                "queue_wait_ms": 0.0,
+                "max_queue_wait_ms": 0.0,
+                "lock_wait_ms": 0.0,
+                "max_lock_wait_ms": 0.0,
+            }
+
+
+def coalescer_stats():
+    return {name: coalescer.stats() for name, coalescer in sorted(COALESCERS.items())}
+
+
+def reset_coalescer_stats():
+    for coalescer in COALESCERS.values():
+        coalescer.reset_stats()
+
+
+attendance_writes = WriteCoalescer("attendance")
+result_writes = WriteCoalescer("results")
@@ -0,0 +1,82 @@
+import contextlib
+import contextvars
+
+from django.db import connections
+
+
+REPLICA = "replica"
+PRIMARY = "default"
+
+# Per request (or per replica_reads block): whether reads may use the
+# replica, and whether anything has been written since.
+_routing = contextvars.ContextVar("replica_routing", default=None)
+
+
+class _Routing:
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+def replica_configured():
+    return REPLICA in connections.databases
+
+
+@contextlib.contextmanager
+def replica_reads(enabled=True):
+    """Send reads in this block to the replica, if one is configured.
+
+    Yields the routing state; ``state.wrote`` tells whether the block wrote
+    anything. After the first write, reads go back to the primary so the
+    block sees its own changes.
+    """
+    state = _Routing(enabled and replica_configured())
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+@contextlib.contextmanager
+def primary_reads():
+    """Read from the primary in this block even if the request may use the replica.
+
+    For code that reads data to write it back or cache it (rollups, ranks,
+    exam stats): computed from a lagging replica, the result would
+    overwrite fresher data. Also works as a decorator. Writes still mark
+    the surrounding state, so the user is pinned to the primary as usual.
+    """
+    state = _routing.get()
+    if state is None:
+        yield
+        return
+    use_replica, state.use_replica = state.use_replica, False
+    try:
+        yield
+    finally:
+        state.use_replica = use_replica
+
+
+class ReplicaRouter:
+    """Route reads to the replica inside ``replica_reads`` and everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is not None and state.use_replica and not state.wrote:
+            return REPLICA
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica is a copy of the primary, so rows from either relate.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema with the data from sync_replica.
+        return db == PRIMARY
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.db.models import Case, ExpressionWrapper, F, FloatField, Value, When
+from django.db.models.lookups import GreaterThanOrEqual, LessThanOrEqual
+
+
+# (minimum percentage, grade), used when settings.GRADING_SCALE is not set.
+DEFAULT_GRADING_SCALE = [
+    (90, "A+"),
+    (80, "A"),
+    (70, "B+"),
+    (60, "B"),
+    (50, "C"),
+    (40, "D"),
+    (0, "F"),
+]
+
+
+DEFAULT_PASS_PERCENTAGE = 40
+
+
+def get_pass_percentage():
+    return getattr(settings, "PASS_PERCENTAGE", DEFAULT_PASS_PERCENTAGE)
+
+
+def get_grading_scale():
+    """Return the configured grading scale, highest band first."""
+    scale = getattr(settings, "GRADING_SCALE", None) or DEFAULT_GRADING_SCALE
+    return sorted(scale, key=lambda band: band[0], reverse=True)
+
+
+def percentage(marks, total_marks):
+    if total_marks <= 0:
+        return 0.0
+    return marks * 100.0 / total_marks
+
+
+def grade_for(marks, total_marks, scale=None):
+    """Grade a single mark in Python, matching ``grade_expression``."""
+    scale = scale or get_grading_scale()
+    score = percentage(marks, total_marks)
+    for minimum, grade in scale:
+        if score >= minimum:
+            return grade
+    return scale[-1][1]
+
+
+def percentage_expression(prefix=""):
+    """SQL expression for a ``Result`` row's percentage, 0 when the total is not positive.
+
+    ``prefix`` is the lookup path to the result, e.g. ``"results__"`` when
+    annotating students.
+    """
+    marks, total_marks = F(f"{prefix}marks"), F(f"{prefix}total_marks")
+    return Case(
+        When(LessThanOrEqual(total_marks, 0), then=Value(0.0)),
+        default=ExpressionWrapper(marks * 100.0 / total_marks, output_field=FloatField()),
+        output_field=FloatField(),
+    )
+
+
+def grade_expression(scale=None):
+    """SQL ``CASE`` expression that grades ``Result`` rows from their marks.
+
+    Lets a whole exam be re-graded with a single ``UPDATE``.
+    """
+    scale = scale or get_grading_scale()
+    lowest = Value(scale[-1][1])
+    score = ExpressionWrapper(F("marks") * 100.0 / F("total_marks"), output_field=FloatField())
+    whens = [When(LessThanOrEqual(F("total_marks"), 0), then=lowest)]
+    whens += [When(GreaterThanOrEqual(score, minimum), then=Value(grade)) for minimum, grade in scale]
+    return Case(*whens, default=lowest)
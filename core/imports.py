@@ -0,0 +1,304 @@
+import csv
+import io
+import itertools
+import os
+import zipfile
+
+from django.conf import settings
+from django.db import transaction
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+from rest_framework import serializers
+
+from .accounts import create_accounts, hash_passwords
+from .models import ClassRoom, ParentProfile, Student, User
+from .versions import STUDENTS, bump
+
+
+class ImportFileError(ValueError):
+    """The file as a whole cannot be read (bad format, missing columns)."""
+
+
+class StudentImportSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255)
+    roll_number = serializers.CharField(max_length=50)
+    class_name = serializers.CharField(max_length=50)
+    section = serializers.CharField(max_length=10)
+    parent_username = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    address = serializers.CharField(required=False, allow_blank=True)
+    phone = serializers.CharField(max_length=20, required=False, allow_blank=True)
+    email = serializers.EmailField(required=False, allow_blank=True)
+
+
+class ParentImportSerializer(serializers.Serializer):
+    username = serializers.RegexField(r"^[\w.@+-]+\Z", max_length=150)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    email = serializers.EmailField(required=False, allow_blank=True)
+    password = serializers.CharField(required=False, allow_blank=True)
+    phone = serializers.CharField(max_length=20, required=False, allow_blank=True)
+    address = serializers.CharField(required=False, allow_blank=True)
+
+
+class StaffImportSerializer(serializers.Serializer):
+    username = serializers.RegexField(r"^[\w.@+-]+\Z", max_length=150)
+    role = serializers.ChoiceField(choices=["PRINCIPAL", "TEACHER", "STAFF"])
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    email = serializers.EmailField(required=False, allow_blank=True)
+    password = serializers.CharField(required=False, allow_blank=True)
+
+    def to_internal_value(self, data):
+        # Accept "teacher" as well as "TEACHER" from spreadsheets.
+        if isinstance(data.get("role"), str):
+            data = dict(data, role=data["role"].upper())
+        return super().to_internal_value(data)
+
+
+def _csv_rows(fileobj):
+    if isinstance(fileobj, io.TextIOBase):
+        text = fileobj
+    else:
+        text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    # Parse the whole file once first, so one that is not UTF-8 or not CSV
+    # is rejected before any chunk is written.
+    start = text.tell()
+    reader = csv.reader(text)
+    try:
+        for _ in reader:
+            pass
+    except UnicodeDecodeError:
+        raise ImportFileError('The file is not UTF-8 text; save it as "CSV UTF-8".')
+    except csv.Error as exc:
+        raise ImportFileError(f"Line {reader.line_num} is not valid CSV: {exc}.")
+    text.seek(start)
+
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if header is None:
+        return
+    yield [column.strip().lower() for column in header]
+    yield from reader
+
+
+def _xlsx_rows(fileobj):
+    # read_only streams rows instead of loading the whole sheet.
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile):
+        raise ImportFileError("The file is not a valid .xlsx workbook.")
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        yield [str(column or "").strip().lower() for column in header]
+        for row in rows:
+            yield ["" if value is None else str(value) for value in row]
+    finally:
+        workbook.close()
+
+
+def read_rows(fileobj, filename, required=()):
+    """Yield ``(row number, {column: value})`` from a CSV or XLSX file.
+
+    Row numbers count the header as row 1, like a spreadsheet. Blank lines
+    are skipped. Raises ``ImportFileError`` if the header lacks one of the
+    ``required`` columns, or if a CSV file is not UTF-8 or not valid CSV.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".xlsx":
+        rows = _xlsx_rows(fileobj)
+    elif extension in (".csv", ".txt", ""):
+        rows = _csv_rows(fileobj)
+    else:
+        raise ImportFileError(f"Unsupported file type {extension!r}; use .csv or .xlsx.")
+    header = next(rows, None)
+    if header is None:
+        raise ImportFileError("The file is empty.")
+    missing = [column for column in required if column not in header]
+    if missing:
+        raise ImportFileError(f"Missing columns: {', '.join(missing)}.")
+    for number, values in enumerate(rows, start=2):
+        if not any(str(value).strip() for value in values):
+            continue
+        yield number, {column: str(value).strip() for column, value in zip(header, values) if column}
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while chunk := list(itertools.islice(rows, size)):
+        yield chunk
+
+
+class _Importer:
+    serializer_class = None
+
+    def __init__(self, hashing_pool=None):
+        self.hashing_pool = hashing_pool
+        self.report = {"rows": 0, "created": 0, "failed": 0, "errors": []}
+
+    @classmethod
+    def required_columns(cls):
+        return [name for name, field in cls.serializer_class().fields.items() if field.required]
+
+    def run(self, rows, chunk_size=None):
+        chunk_size = chunk_size or getattr(settings, "IMPORT_CHUNK_SIZE", 500)
+        for chunk in _chunks(rows, chunk_size):
+            self.report["rows"] += len(chunk)
+            valid = []
+            for number, row in chunk:
+                serializer = self.serializer_class(data=row)
+                if serializer.is_valid():
+                    valid.append((number, serializer.validated_data))
+                else:
+                    self.fail(number, serializer.errors)
+            valid = self.prepare(self.check(valid))
+            if valid:
+                with transaction.atomic():
+                    self.report["created"] += self.create(valid)
+        self.report["errors"].sort(key=lambda error: error["row"])
+        return self.report
+
+    def fail(self, number, errors):
+        self.report["failed"] += 1
+        self.report["errors"].append({"row": number, "errors": errors})
+
+    def check(self, rows):
+        """Drop rows that clash with the database or earlier rows; returns the rest."""
+        return rows
+
+    def prepare(self, rows):
+        """Work to do before the chunk's transaction opens; returns the rows."""
+        return rows
+
+    def create(self, rows):
+        raise NotImplementedError
+
+
+class StudentImporter(_Importer):
+    """Create students, resolving ``(class_name, section)`` from a map loaded once."""
+
+    serializer_class = StudentImportSerializer
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.classrooms = {
+            (name.lower(), section.lower()): pk
+            for pk, name, section in ClassRoom.objects.values_list("pk", "name", "section")
+        }
+        self.seen = set()
+
+    def check(self, rows):
+        checked = []
+        for number, row in rows:
+            classroom_id = self.classrooms.get((row["class_name"].lower(), row["section"].lower()))
+            if classroom_id is None:
+                self.fail(number, {"class_name": [f"No class {row['class_name']} - {row['section']}."]})
+                continue
+            row["classroom_id"] = classroom_id
+            checked.append((number, row))
+
+        usernames = {row["parent_username"] for _, row in checked if row.get("parent_username")}
+        parents = {}
+        if usernames:
+            parents = dict(
+                ParentProfile.objects.filter(user__username__in=usernames).values_list("user__username", "pk")
+            )
+        taken = set(
+            Student.objects.filter(
+                classroom_id__in={row["classroom_id"] for _, row in checked},
+                roll_number__in={row["roll_number"] for _, row in checked},
+            ).values_list("classroom_id", "roll_number")
+        )
+        rows, checked = checked, []
+        for number, row in rows:
+            key = (row["classroom_id"], row["roll_number"])
+            username = row.get("parent_username")
+            if key in taken or key in self.seen:
+                self.fail(number, {"roll_number": ["A student with this roll number already exists in the class."]})
+            elif username and username not in parents:
+                self.fail(number, {"parent_username": [f"No parent with username {username}."]})
+            else:
+                self.seen.add(key)
+                row["parent_id"] = parents.get(username)
+                checked.append((number, row))
+        return checked
+
+    def create(self, rows):
+        students = Student.objects.bulk_create(
+            Student(
+                name=row["name"],
+                roll_number=row["roll_number"],
+                classroom_id=row["classroom_id"],
+                parent_id=row["parent_id"],
+                address=row.get("address", ""),
+                phone=row.get("phone", ""),
+                email=row.get("email", ""),
+            )
+            for _, row in rows
+        )
+        bump(STUDENTS)
+        return len(students)
+
+
+class _AccountImporter(_Importer):
+    """Create user accounts, hashing a chunk's passwords first (in parallel with a pool)."""
+
+    role = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.seen = set()
+
+    def check(self, rows):
+        taken = set(
+            User.objects.filter(username__in={row["username"] for _, row in rows}).values_list("username", flat=True)
+        )
+        checked = []
+        for number, row in rows:
+            if row["username"] in taken or row["username"] in self.seen:
+                self.fail(number, {"username": ["A user with that username already exists."]})
+                continue
+            self.seen.add(row["username"])
+            checked.append((number, row))
+        return checked
+
+    def prepare(self, rows):
+        # A blank password leaves the account unusable until it is reset.
+        passwords = hash_passwords([row.get("password") for _, row in rows], self.hashing_pool)
+        for (_, row), password in zip(rows, passwords):
+            row["password"] = password
+        return rows
+
+    def create(self, rows):
+        return len(create_accounts([row for _, row in rows], self.role))
+
+
+class ParentImporter(_AccountImporter):
+    """Create parent users and their profiles, two ``bulk_create`` calls per chunk."""
+
+    serializer_class = ParentImportSerializer
+    role = User.Roles.PARENT
+
+
+class StaffImporter(_AccountImporter):
+    serializer_class = StaffImportSerializer
+
+
+IMPORTERS = {"students": StudentImporter, "parents": ParentImporter, "staff": StaffImporter}
+
+
+def import_file(kind, fileobj, filename, chunk_size=None, hashing_pool=None):
+    """Import ``kind`` ("students", "parents" or "staff") from a CSV or XLSX file.
+
+    Rows are validated and written ``IMPORT_CHUNK_SIZE`` at a time, one
+    transaction per chunk. Invalid rows are reported and skipped; the rest
+    of the file is still imported. Returns ``{"rows", "created", "failed",
+    "errors": [{"row", "errors"}]}``. Raises ``ImportFileError`` when the
+    file itself cannot be read. Passwords are hashed over ``hashing_pool``
+    (see ``core.accounts.password_hashing_pool``) when given, otherwise in
+    this process.
+    """
+    importer = IMPORTERS[kind](hashing_pool=hashing_pool)
+    return importer.run(read_rows(fileobj, filename, importer.required_columns()), chunk_size)
@@ -0,0 +1,37 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.notifications import archive_batch, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = "Move read notifications past the retention period into the archive, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Retention in days (default NOTIFICATION_RETENTION_DAYS).")
+        parser.add_argument("--batch-size", type=int, default=None, help="Notifications moved per transaction.")
+        parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches.")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to pause between batches.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or getattr(settings, "NOTIFICATION_ARCHIVE_BATCH_SIZE", 1000)
+        before = retention_cutoff(options["days"])
+        moved = batches = 0
+        started = time.monotonic()
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            count = archive_batch(before, batch_size)
+            if not count:
+                break
+            moved += count
+            batches += 1
+            self.stdout.write(f"batch={batches} moved={count}")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {moved} notifications older than {before:%Y-%m-%d} "
+                f"in {batches} batches ({time.monotonic() - started:.2f}s)."
+            )
+        )
@@ -0,0 +1,55 @@
+import os
+import time
+import uuid
+
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.accounts import provision_accounts
+from core.parent_api import ParentAdminSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure parent accounts created per second, one by one through the API "
+        "serializer and in bulk with serial and parallel password hashing. Every run "
+        "is rolled back, so the database is left as it was."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--accounts", type=int, default=40, help="Accounts per run.")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes for the parallel run.")
+
+    def handle(self, *args, **options):
+        count, workers = options["accounts"], options["workers"]
+        self.stdout.write(f"{count} accounts per run, hasher {get_hasher().algorithm}, {os.cpu_count()} CPUs")
+        runs = [
+            ("per-account", lambda accounts: [self.create_one(account) for account in accounts]),
+            ("bulk, 1 worker", lambda accounts: provision_accounts(accounts, "PARENT", workers=1)),
+            (f"bulk, {workers} worker{'s' if workers > 1 else ''}", lambda accounts: provision_accounts(accounts, "PARENT", workers=workers)),
+        ]
+        for label, run in runs:
+            prefix = uuid.uuid4().hex[:8]
+            accounts = [
+                {"username": f"bench-{prefix}-{index}", "password": f"pw-{prefix}-{index}", "phone": "0"}
+                for index in range(count)
+            ]
+            started = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    run(accounts)
+                    elapsed = time.perf_counter() - started
+                    raise Rollback
+            except Rollback:
+                pass
+            self.stdout.write(f"{label:<20}{count / elapsed:>10.1f} accounts/s{elapsed:>9.2f}s")
+
+    def create_one(self, account):
+        serializer = ParentAdminSerializer(data=account)
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
@@ -0,0 +1,159 @@
+import datetime
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+# "default" is what Django does out of the box: rollback journal, deferred
+# transactions and a new connection per request. "production" is the
+# SQLITE_PRODUCTION profile from settings.
+PROFILES = {
+    "default": {"init_command": "", "begin": "BEGIN", "persistent": False},
+    "production": {
+        "init_command": settings.SQLITE_PRODUCTION_INIT_COMMAND,
+        "begin": "BEGIN IMMEDIATE",
+        "persistent": True,
+    },
+}
+
+SCHEMA = """
+CREATE TABLE student (id INTEGER PRIMARY KEY, classroom_id INTEGER NOT NULL, roll_number TEXT, name TEXT);
+CREATE INDEX student_classroom ON student (classroom_id);
+CREATE TABLE attendance (
+    id INTEGER PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES student (id),
+    classroom_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    status TEXT NOT NULL,
+    UNIQUE (student_id, date)
+);
+CREATE INDEX attendance_class_date ON attendance (classroom_id, date);
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure reader/writer throughput of a scratch SQLite file under the "
+        "default and production connection profiles. The workload mirrors "
+        "bulk attendance submissions racing class attendance listings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=5.0, help="Duration per profile.")
+        parser.add_argument("--writers", type=int, default=4)
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--classes", type=int, default=20)
+        parser.add_argument("--students", type=int, default=40, help="Students per class.")
+        parser.add_argument("--profile", choices=sorted(PROFILES), action="append", help="Limit to these profiles.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{options['writers']} writers, {options['readers']} readers, "
+            f"{options['classes']} classes x {options['students']} students, {options['seconds']:g}s per profile"
+        )
+        self.stdout.write(f"{'profile':<12}{'writes/s':>10}{'reads/s':>10}{'locked':>8}{'write p95 ms':>14}{'read p95 ms':>13}")
+        for name in options["profile"] or PROFILES:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "bench.sqlite3")
+                self.create_database(path, options["classes"], options["students"])
+                stats = self.run_profile(path, PROFILES[name], options)
+            self.stdout.write(
+                f"{name:<12}{stats['writes'] / options['seconds']:>10.1f}{stats['reads'] / options['seconds']:>10.1f}"
+                f"{stats['locked']:>8}{stats['write_p95']:>14.1f}{stats['read_p95']:>13.1f}"
+            )
+
+    def create_database(self, path, classes, students):
+        connection = sqlite3.connect(path)
+        connection.executescript(SCHEMA)
+        connection.executemany(
+            "INSERT INTO student (classroom_id, roll_number, name) VALUES (?, ?, ?)",
+            [(c, str(n), f"Student {c}-{n}") for c in range(classes) for n in range(students)],
+        )
+        connection.commit()
+        connection.close()
+
+    def connect(self, path, profile):
+        connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        for statement in filter(None, (part.strip() for part in profile["init_command"].split(";"))):
+            connection.execute(statement)
+        return connection
+
+    def run_profile(self, path, profile, options):
+        deadline = time.monotonic() + options["seconds"]
+        lock = threading.Lock()
+        stats = {"writes": 0, "reads": 0, "locked": 0}
+        latencies = {"write": [], "read": []}
+        today = datetime.date(2025, 1, 6)
+
+        def record(kind, started, ok):
+            with lock:
+                if ok:
+                    stats[f"{kind}s"] += 1
+                    latencies[kind].append((time.monotonic() - started) * 1000)
+                else:
+                    stats["locked"] += 1
+
+        def worker(kind):
+            rng = random.Random()
+            connection = self.connect(path, profile) if profile["persistent"] else None
+            while time.monotonic() < deadline:
+                started = time.monotonic()
+                conn = connection or self.connect(path, profile)
+                classroom = rng.randrange(options["classes"])
+                date = (today - datetime.timedelta(days=rng.randrange(30))).isoformat()
+                try:
+                    if kind == "write":
+                        self.write(conn, profile, classroom, date, rng)
+                    else:
+                        self.read(conn, classroom, date)
+                    ok = True
+                except sqlite3.OperationalError as exc:
+                    if "locked" not in str(exc) and "busy" not in str(exc):
+                        raise
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    ok = False
+                finally:
+                    if connection is None:
+                        conn.close()
+                record(kind, started, ok)
+            if connection is not None:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=("write",)) for _ in range(options["writers"])]
+        threads += [threading.Thread(target=worker, args=("read",)) for _ in range(options["readers"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for kind, values in latencies.items():
+            stats[f"{kind}_p95"] = statistics.quantiles(values, n=20)[-1] if len(values) > 1 else 0.0
+        return stats
+
+    def write(self, conn, profile, classroom, date, rng):
+        # Same shape as AttendanceBulkCreateView: resolve the students, upsert
+        # the class in one statement, read the rows back.
+        conn.execute(profile["begin"])
+        students = [row[0] for row in conn.execute("SELECT id FROM student WHERE classroom_id = ?", (classroom,))]
+        conn.executemany(
+            "INSERT INTO attendance (student_id, classroom_id, date, status) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (student_id, date) DO UPDATE SET status = excluded.status",
+            [(student, classroom, date, rng.choice(("PRESENT", "ABSENT", "LATE"))) for student in students],
+        )
+        conn.execute("SELECT COUNT(*) FROM attendance WHERE classroom_id = ? AND date = ?", (classroom, date)).fetchone()
+        conn.execute("COMMIT")
+
+    def read(self, conn, classroom, date):
+        conn.execute(
+            "SELECT a.id, a.status, s.name FROM attendance a JOIN student s ON s.id = a.student_id "
+            "WHERE a.classroom_id = ? AND a.date = ? ORDER BY s.roll_number",
+            (classroom, date),
+        ).fetchall()
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.accounts import password_hashing_pool
+from core.imports import IMPORTERS, ImportFileError, import_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Import students or parents from a CSV or XLSX file. Invalid rows are "
+        "reported and skipped; import parents before the students that refer to them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORTERS))
+        parser.add_argument("path")
+        parser.add_argument("--chunk-size", type=int, default=None, help="Rows per transaction (default IMPORT_CHUNK_SIZE).")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            with open(path, "rb") as fileobj, password_hashing_pool() as pool:
+                report = import_file(options["kind"], fileobj, path, options["chunk_size"], pool)
+        except (OSError, ImportFileError) as exc:
+            raise CommandError(str(exc))
+        for error in report["errors"]:
+            messages = "; ".join(
+                f"{field}: {' '.join(str(message) for message in field_messages)}"
+                for field, field_messages in error["errors"].items()
+            )
+            self.stderr.write(f"row {error['row']}: {messages}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['created']} of {report['rows']} {options['kind']} ({report['failed']} rows failed)."
+            )
+        )
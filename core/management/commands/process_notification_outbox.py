@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.outbox import backlog, claim_events, default_worker_id, process_events
+
+
+class Command(BaseCommand):
+    help = "Expand pending notification outbox events into notifications."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--claim", type=int, default=50, help="Events claimed per round.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Notifications inserted per statement.")
+        parser.add_argument("--max-attempts", type=int, default=None, help="Attempts before an event is marked failed.")
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting once drained.")
+        parser.add_argument("--sleep", type=float, default=1.0, help="Seconds to wait between polls with --loop.")
+        parser.add_argument("--worker-id", default=None, help="Name recorded on claimed events.")
+
+    def handle(self, *args, **options):
+        worker_id = options["worker_id"] or default_worker_id()
+        totals = {"claimed": 0, "done": 0, "retried": 0, "failed": 0, "notifications": 0}
+        started = time.monotonic()
+        while True:
+            round_started = time.monotonic()
+            events = claim_events(options["claim"], worker_id)
+            if events:
+                metrics = process_events(events, options["batch_size"], options["max_attempts"])
+                for key, value in metrics.items():
+                    totals[key] += value
+                elapsed = time.monotonic() - round_started
+                self.stdout.write(
+                    "claimed={claimed} done={done} retried={retried} failed={failed} "
+                    "notifications={notifications} ".format(**metrics)
+                    + f"rate={metrics['notifications'] / max(elapsed, 1e-6):.0f}/s"
+                )
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["sleep"])
+
+        elapsed = time.monotonic() - started
+        pending = backlog()
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Processed {done} events ({notifications} notifications, {retried} retried, "
+                "{failed} failed) ".format(**totals)
+                + f"in {elapsed:.2f}s. Backlog: "
+                + ", ".join(f"{state.lower()}={count}" for state, count in pending.items())
+            )
+        )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from core.rollups import rebuild_class_summaries, rebuild_student_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the daily per-classroom attendance summaries and the "
+        "per-student attendance rollups from Attendance."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="First date to rebuild (YYYY-MM-DD).")
+        parser.add_argument("--end", help="Last date to rebuild (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        bounds = {}
+        for name in ("start", "end"):
+            value = options[name]
+            if value is None:
+                continue
+            bounds[name] = parse_date(value)
+            if bounds[name] is None:
+                raise CommandError(f"--{name} must be a date in YYYY-MM-DD format.")
+
+        with transaction.atomic():
+            rows = rebuild_class_summaries(**bounds)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} class attendance summary rows."))
+
+        # Rollups are term-to-date, so a date range does not apply to them.
+        if not bounds:
+            with transaction.atomic():
+                students = rebuild_student_rollups()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {students} student attendance rollups."))
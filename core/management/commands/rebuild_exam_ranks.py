@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.ranking import rebuild_exam_ranks
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized per-exam class ranks (ExamRank) from Result."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200, help="Exams ranked per transaction.")
+
+    def handle(self, *args, **options):
+        ranks = rebuild_exam_ranks(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {ranks} exam ranks."))
@@ -0,0 +1,46 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.db_router import PRIMARY, REPLICA
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database onto the read replica file "
+        "(set READ_REPLICA_DB). Other backends replicate on their own."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=None, help="Keep syncing every N seconds.")
+        parser.add_argument("--pages", type=int, default=1024, help="Pages copied per backup step.")
+
+    def handle(self, *args, **options):
+        if REPLICA not in connections.databases:
+            raise CommandError("No replica configured; set READ_REPLICA_DB to a SQLite file path.")
+        primary, replica = connections.databases[PRIMARY], connections.databases[REPLICA]
+        if not all(db["ENGINE"] == "django.db.backends.sqlite3" for db in (primary, replica)):
+            raise CommandError("sync_replica only copies SQLite databases.")
+
+        while True:
+            started = time.monotonic()
+            self.sync(primary["NAME"], replica["NAME"], options["pages"])
+            self.stdout.write(
+                self.style.SUCCESS(f"Replica synced in {time.monotonic() - started:.2f}s.")
+            )
+            if options["interval"] is None:
+                break
+            time.sleep(options["interval"])
+
+    def sync(self, source_path, target_path, pages):
+        # SQLite's online backup copies a consistent snapshot in steps, so
+        # writers on the primary are only blocked briefly between steps.
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target, pages=pages)
+        finally:
+            target.close()
+            source.close()
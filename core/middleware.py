@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+
+from .auth import ClaimsJWTAuthentication
+from .db_router import replica_configured, replica_reads
+
+
+def _pin_key(user_id):
+    return f"primary-pin:{user_id}"
+
+
+def _user_id(request):
+    """The requesting user's id, from the bearer token or the session."""
+    if request.META.get("HTTP_AUTHORIZATION"):
+        try:
+            authenticated = ClaimsJWTAuthentication().authenticate(request)
+        except APIException:
+            return None
+        return authenticated[0].pk if authenticated else None
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    return None
+
+
+class ReplicaRoutingMiddleware:
+    """Let safe-method requests read from the replica, with read-your-writes.
+
+    A user who wrote something (an unsafe request, or any write during a
+    safe one) is pinned to the primary for ``READ_YOUR_WRITES_SECONDS``, so
+    they never see the replica lag behind their own change. Pins live in
+    the default cache; use a shared backend when running several workers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+        user_id = _user_id(request)
+        pinned = user_id is not None and cache.get(_pin_key(user_id)) is not None
+        with replica_reads(request.method in SAFE_METHODS and not pinned) as state:
+            response = self.get_response(request)
+        if user_id is not None and (request.method not in SAFE_METHODS or state.wrote):
+            cache.set(_pin_key(user_id), 1, getattr(settings, "READ_YOUR_WRITES_SECONDS", 5))
+        return response
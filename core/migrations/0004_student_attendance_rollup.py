@@ -0,0 +1,27 @@
+# Generated by Django 5.2.9 on 2026-10-18 20:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_class_attendance_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentAttendanceRollup',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='attendance_rollup', serialize=False, to='core.student')),
+                ('term_start', models.DateField()),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('late', models.PositiveIntegerField(default=0)),
+                ('current_absence_streak', models.PositiveIntegerField(default=0)),
+                ('last_absent_date', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_student_attendance_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamRank',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveIntegerField()),
+                ('dense_rank', models.PositiveIntegerField()),
+                ('percentile', models.FloatField()),
+                ('class_size', models.PositiveIntegerField()),
+                ('classroom', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exam_ranks', to='core.classroom')),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ranks', to='core.exam')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exam_ranks', to='core.student')),
+            ],
+            options={
+                'ordering': ['exam_id', 'rank'],
+                'unique_together': {('exam', 'student')},
+            },
+        ),
+    ]
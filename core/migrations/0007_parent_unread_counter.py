@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_unread(apps, schema_editor):
+    Notification = apps.get_model("core", "Notification")
+    ParentProfile = apps.get_model("core", "ParentProfile")
+    unread = (
+        Notification.objects.filter(parent_id=OuterRef("pk"), is_read=False)
+        .order_by()
+        .values("parent_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    ParentProfile.objects.update(unread_notifications=Coalesce(Subquery(unread), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='parentprofile',
+            name='unread_notifications',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_unread, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_parent_unread_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationSubject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('ATTENDANCE', 'Attendance Alert'), ('EXAM_RESULT', 'Exam Result'), ('MEETING', 'Parent Meeting')], max_length=20)),
+                ('subject', models.CharField(max_length=255)),
+                ('date', models.DateTimeField()),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subjects', to='core.notification')),
+                ('parent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.parentprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['parent', 'type', 'date'], name='notif_subject_lookup_idx')],
+            },
+        ),
+    ]
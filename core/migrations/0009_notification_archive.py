@@ -0,0 +1,30 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_notification_subject'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedNotification',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('type', models.CharField(choices=[('ATTENDANCE', 'Attendance Alert'), ('EXAM_RESULT', 'Exam Result'), ('MEETING', 'Parent Meeting')], max_length=20)),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('date', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('parent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to='core.parentprofile')),
+            ],
+            options={
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['parent', '-date', '-id'], name='archived_notif_parent_date_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:40
+
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+from django.db.models import Max, OuterRef, Subquery
+
+BACKFILL_CHUNK = 5000
+
+
+def backfill_classroom(apps, schema_editor):
+    """Copy student.classroom_id onto existing rows, one id range per transaction."""
+    Student = apps.get_model("core", "Student")
+    student_classroom = Subquery(Student.objects.filter(pk=OuterRef("student_id")).values("classroom_id")[:1])
+    for model_name in ("Attendance", "Result"):
+        model = apps.get_model("core", model_name)
+        last_id = model.objects.aggregate(last=Max("id"))["last"] or 0
+        for start in range(0, last_id + 1, BACKFILL_CHUNK):
+            with transaction.atomic():
+                model.objects.filter(
+                    id__gte=start, id__lt=start + BACKFILL_CHUNK, classroom__isnull=True
+                ).update(classroom_id=student_classroom)
+
+
+class Migration(migrations.Migration):
+
+    # Each backfill chunk commits on its own, so a large table is not
+    # rewritten in one transaction.
+    atomic = False
+
+    dependencies = [
+        ('core', '0009_notification_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='classroom',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attendance_records', to='core.classroom'),
+        ),
+        migrations.AddField(
+            model_name='result',
+            name='classroom',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='results', to='core.classroom'),
+        ),
+        migrations.RunPython(backfill_classroom, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='attendance',
+            name='classroom',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='attendance_records', to='core.classroom'),
+        ),
+        migrations.AlterField(
+            model_name='result',
+            name='classroom',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='results', to='core.classroom'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['classroom', 'date'], name='attendance_class_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['classroom', 'exam'], name='result_class_exam_idx'),
+        ),
+    ]
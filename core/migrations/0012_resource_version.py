@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-18 21:11
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def create_counters(apps, schema_editor):
+    ResourceVersion = apps.get_model("core", "ResourceVersion")
+    ResourceVersion.objects.bulk_create(
+        [ResourceVersion(key=key, version=1) for key in ("classroom", "student", "parent", "exam")],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_index_audit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceVersion',
+            fields=[
+                ('key', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RunPython(create_counters, migrations.RunPython.noop),
+    ]
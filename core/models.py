@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -17,6 +18,12 @@ class User(AbstractUser):
         default=Roles.PARENT,
     )
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Staff listing filters on role and sorts by username.
+            models.Index(fields=["role", "username"], name="user_role_username_idx"),
+        ]
+
 
 class ClassRoom(models.Model):
     name = models.CharField(max_length=50)
@@ -33,6 +40,8 @@ class ParentProfile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="parent_profile")
     phone = models.CharField(max_length=20, blank=True)
     address = models.TextField(blank=True)
+    # Maintained by core.notifications whenever notifications are created or read.
+    unread_notifications = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self) -> str:  # pragma: no cover
         return self.user.get_full_name() or self.user.username
@@ -62,6 +71,11 @@ class Attendance(models.Model):
         LATE = "LATE", "Late"
 
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="attendance_records")
+    # Copy of student.classroom so class-day queries need no join; kept in
+    # step by core.bulk.move_student_records when a student changes class.
+    classroom = models.ForeignKey(
+        ClassRoom, on_delete=models.CASCADE, related_name="attendance_records", editable=False
+    )
     date = models.DateField()
     status = models.CharField(max_length=10, choices=Status.choices)
     marked_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name="marked_attendance")
@@ -70,6 +84,69 @@ class Attendance(models.Model):
     class Meta:
         unique_together = ("student", "date")
         ordering = ["-date", "student__roll_number"]
+        indexes = [
+            # By-class listings and summaries; by-student listings use the
+            # (student, date) unique index.
+            models.Index(fields=["classroom", "date"], name="attendance_class_date_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.classroom_id is None:
+            self.classroom_id = self.student.classroom_id
+        super().save(*args, **kwargs)
+
+
+class ClassAttendanceSummary(models.Model):
+    """Per-classroom daily attendance counts, kept in step with ``Attendance``.
+
+    Maintained by ``core.rollups.refresh_class_summaries`` on every bulk
+    attendance write; ``manage.py rebuild_attendance_summary`` recomputes it
+    from scratch.
+    """
+
+    classroom = models.ForeignKey(ClassRoom, on_delete=models.CASCADE, related_name="attendance_summaries")
+    date = models.DateField()
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+    late = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("classroom", "date")
+        ordering = ["-date", "classroom_id"]
+        indexes = [
+            # Dashboard reads a date range across every classroom.
+            models.Index(fields=["date", "classroom"], name="class_summary_date_idx"),
+        ]
+
+
+class StudentAttendanceRollup(models.Model):
+    """Term-to-date attendance counts and absence streak for one student.
+
+    Maintained by ``core.rollups.refresh_student_rollups`` on every bulk
+    attendance write, so dashboards never scan a student's full history.
+    """
+
+    student = models.OneToOneField(
+        Student, on_delete=models.CASCADE, primary_key=True, related_name="attendance_rollup"
+    )
+    term_start = models.DateField()
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+    late = models.PositiveIntegerField(default=0)
+    current_absence_streak = models.PositiveIntegerField(default=0)
+    last_absent_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def total(self):
+        return self.present + self.absent + self.late
+
+    @property
+    def attendance_percentage(self):
+        if not self.total:
+            return None
+        return round((self.present + self.late) * 100.0 / self.total, 1)
 
 
 class Exam(models.Model):
@@ -78,6 +155,11 @@ class Exam(models.Model):
     classroom = models.ForeignKey(ClassRoom, on_delete=models.CASCADE, related_name="exams")
     date = models.DateField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["classroom", "date"], name="exam_class_date_idx"),
+        ]
+
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.name} - {self.subject} ({self.classroom})"
 
@@ -85,6 +167,8 @@ class Exam(models.Model):
 class Result(models.Model):
     exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name="results")
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="results")
+    # Copy of student.classroom, see Attendance.classroom.
+    classroom = models.ForeignKey(ClassRoom, on_delete=models.CASCADE, related_name="results", editable=False)
     marks = models.FloatField()
     total_marks = models.FloatField()
     grade = models.CharField(max_length=5)
@@ -94,6 +178,36 @@ class Result(models.Model):
 
     class Meta:
         unique_together = ("exam", "student")
+        indexes = [
+            models.Index(fields=["student", "exam"], name="result_student_exam_idx"),
+            models.Index(fields=["classroom", "exam"], name="result_class_exam_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.classroom_id is None:
+            self.classroom_id = self.student.classroom_id
+        super().save(*args, **kwargs)
+
+
+class ExamRank(models.Model):
+    """A student's standing within their classroom for one exam.
+
+    Materialized from ``Result`` with window functions by
+    ``core.ranking.refresh_exam_ranks`` after every bulk result write.
+    """
+
+    exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name="ranks")
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="exam_ranks")
+    classroom = models.ForeignKey(ClassRoom, on_delete=models.CASCADE, related_name="exam_ranks")
+    score = models.FloatField()
+    rank = models.PositiveIntegerField()
+    dense_rank = models.PositiveIntegerField()
+    percentile = models.FloatField()
+    class_size = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = ("exam", "student")
+        ordering = ["exam_id", "rank"]
 
 
 class Meeting(models.Model):
@@ -106,6 +220,12 @@ class Meeting(models.Model):
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name="created_meetings")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-date", "-id"], name="meeting_date_idx"),
+            models.Index(fields=["classroom", "date"], name="meeting_class_date_idx"),
+        ]
+
     def __str__(self) -> str:  # pragma: no cover
         return self.title
 
@@ -125,4 +245,111 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ["-date"]
+        indexes = [
+            # Matches the list's (-date, -id) keyset order, so pages need no sort.
+            models.Index(fields=["parent", "-date", "-id"], name="notification_parent_date_idx"),
+            # Mark-all-read and unread recounts touch only unread rows.
+            models.Index(
+                fields=["parent"], condition=models.Q(is_read=False), name="notification_parent_unread_idx"
+            ),
+        ]
+
+
+class NotificationSubject(models.Model):
+    """One subject (an absence, a result, a meeting) a notification told a parent about.
+
+    ``core.outbox`` skips subjects a parent already heard about within
+    ``NOTIFICATION_DEDUP_WINDOW_DAYS``; older ones are news again.
+    """
+
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name="subjects")
+    parent = models.ForeignKey(ParentProfile, on_delete=models.CASCADE, related_name="+")
+    type = models.CharField(max_length=20, choices=Notification.Types.choices)
+    subject = models.CharField(max_length=255)
+    date = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["parent", "type", "date"], name="notif_subject_lookup_idx"),
+        ]
+
+
+class ArchivedNotification(models.Model):
+    """A read notification moved out of ``Notification`` by the retention job.
+
+    Keeps the original id so links and cursors stay valid; read state and
+    dedup subjects are not needed once a notification is archived.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    parent = models.ForeignKey(ParentProfile, on_delete=models.CASCADE, related_name="archived_notifications")
+    type = models.CharField(max_length=20, choices=Notification.Types.choices)
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    date = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-date"]
+        indexes = [
+            models.Index(fields=["parent", "-date", "-id"], name="archived_notif_parent_date_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.title} ({self.date:%Y-%m-%d})"
+
+
+class NotificationOutbox(models.Model):
+    """A pending notification fan-out, written in the same transaction as its cause.
+
+    Requests only insert one row here; ``manage.py process_notification_outbox``
+    expands it into ``Notification`` rows outside the request's transaction.
+    """
+
+    class Kinds(models.TextChoices):
+        ATTENDANCE = "ATTENDANCE", "Attendance absences"
+        EXAM_RESULT = "EXAM_RESULT", "Exam results"
+        MEETING = "MEETING", "Parent meeting"
+
+    class States(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        PROCESSING = "PROCESSING", "Processing"
+        DONE = "DONE", "Done"
+        FAILED = "FAILED", "Failed"
+
+    kind = models.CharField(max_length=20, choices=Kinds.choices)
+    payload = models.JSONField(default=dict)
+    state = models.CharField(max_length=20, choices=States.choices, default=States.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    claimed_by = models.CharField(max_length=100, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    notifications_created = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["state", "available_at"], name="outbox_state_available_idx"),
+        ]
 
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.kind} #{self.pk} ({self.state})"
+
+
+class ResourceVersion(models.Model):
+    """A counter bumped on every write to one kind of resource.
+
+    List endpoints derive their ``ETag``/``Last-Modified`` from these rows,
+    so conditional requests are answered without running the list query;
+    see ``core.versions``.
+    """
+
+    key = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.key} v{self.version}"
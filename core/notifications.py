@@ -0,0 +1,102 @@
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import ArchivedNotification, Notification, ParentProfile
+
+
+def add_unread(counts):
+    """Add ``{parent_id: new_unread}`` to the parents' counters with one ``UPDATE``."""
+    counts = {parent_id: n for parent_id, n in counts.items() if n}
+    if not counts:
+        return
+    increment = Case(
+        *[When(pk=parent_id, then=Value(n)) for parent_id, n in counts.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    ParentProfile.objects.filter(pk__in=counts).update(
+        unread_notifications=F("unread_notifications") + increment
+    )
+
+
+def _subtract_unread(parent_id, n):
+    if n:
+        ParentProfile.objects.filter(pk=parent_id).update(
+            unread_notifications=Greatest(F("unread_notifications") - n, 0)
+        )
+
+
+@transaction.atomic
+def mark_read(parent_id, ids):
+    """Mark the parent's notifications ``ids`` as read with a single ``UPDATE``.
+
+    Returns the number of notifications that were unread before.
+    """
+    updated = Notification.objects.filter(parent_id=parent_id, pk__in=ids, is_read=False).update(
+        is_read=True
+    )
+    _subtract_unread(parent_id, updated)
+    return updated
+
+
+@transaction.atomic
+def mark_all_read(parent_id):
+    updated = Notification.objects.filter(parent_id=parent_id, is_read=False).update(is_read=True)
+    _subtract_unread(parent_id, updated)
+    return updated
+
+
+def recount_unread(parent_ids=None):
+    """Reset counters from the notification table, e.g. after manual edits."""
+    unread = (
+        Notification.objects.filter(parent_id=OuterRef("pk"), is_read=False)
+        .order_by()
+        .values("parent_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    parents = ParentProfile.objects.all()
+    if parent_ids is not None:
+        parents = parents.filter(pk__in=parent_ids)
+    return parents.update(unread_notifications=Coalesce(Subquery(unread), 0))
+
+
+ARCHIVED_FIELDS = ["id", "parent_id", "type", "title", "message", "date"]
+
+
+def retention_cutoff(days=None):
+    """Read notifications older than this are archived.
+
+    Never later than the dedup window start, so the outbox still sees every
+    notification it deduplicates against.
+    """
+    days = days if days is not None else getattr(settings, "NOTIFICATION_RETENTION_DAYS", 90)
+    days = max(days, getattr(settings, "NOTIFICATION_DEDUP_WINDOW_DAYS", 60))
+    return timezone.now() - datetime.timedelta(days=days)
+
+
+def archive_batch(before, batch_size=1000):
+    """Move up to ``batch_size`` read notifications dated before ``before``.
+
+    Copies them into ``ArchivedNotification`` and deletes them in one short
+    transaction, so the hot table is never locked for long. Returns how many
+    were moved; 0 means nothing is left to archive.
+    """
+    with transaction.atomic():
+        rows = list(
+            Notification.objects.filter(is_read=True, date__lt=before)
+            .order_by("pk")
+            .values(*ARCHIVED_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+        ArchivedNotification.objects.bulk_create(
+            [ArchivedNotification(**row) for row in rows], ignore_conflicts=True
+        )
+        Notification.objects.filter(pk__in=[row["id"] for row in rows]).delete()
+    return len(rows)
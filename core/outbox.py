@@ -0,0 +1,291 @@
+import datetime
+import os
+import socket
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import (
+    Attendance,
+    Meeting,
+    Notification,
+    NotificationOutbox,
+    NotificationSubject,
+    ParentProfile,
+    Result,
+    Student,
+)
+from .notifications import add_unread
+
+
+Kinds = NotificationOutbox.Kinds
+States = NotificationOutbox.States
+
+# A claim older than this is assumed to belong to a crashed worker.
+CLAIM_TIMEOUT = datetime.timedelta(minutes=10)
+
+
+def enqueue(kind, payload):
+    """Record a notification fan-out to run after the current transaction.
+
+    Costs one ``INSERT`` inside the caller's transaction. With
+    ``NOTIFICATION_OUTBOX_EAGER`` the event is also processed once the
+    transaction commits, which keeps development setups working without a
+    worker.
+    """
+    event = NotificationOutbox.objects.create(kind=kind, payload=payload)
+    if getattr(settings, "NOTIFICATION_OUTBOX_EAGER", False):
+        transaction.on_commit(lambda: process_events(claim_events(ids=[event.pk])))
+    return event
+
+
+def _join_names(names):
+    names = list(names)
+    if len(names) == 1:
+        return names[0]
+    return ", ".join(names[:-1]) + f" and {names[-1]}"
+
+
+def _render_attendance(records):
+    by_date = defaultdict(list)
+    for record in records:
+        by_date[record.date].append(record.student.name)
+    sentences = [
+        f"{_join_names(names)} {'is' if len(names) == 1 else 'are'} absent on {date}."
+        for date, names in sorted(by_date.items())
+    ]
+    return "Attendance Alert", " ".join(sentences)
+
+
+def _render_results(results):
+    exams = {result.exam.name for result in results}
+    prefix = "Exam Result" if len(results) == 1 else "Exam Results"
+    title = f"{prefix}: {exams.pop()}" if len(exams) == 1 else prefix
+    message = "\n".join(
+        f"{result.student.name}'s result for {result.exam.subject}: "
+        f"{result.marks}/{result.total_marks} (Grade {result.grade})."
+        for result in results
+    )
+    return title, message
+
+
+def _render_meeting(meetings):
+    meeting = meetings[0]
+    return (
+        f"Parent Meeting: {meeting.title}",
+        f"Meeting scheduled on {meeting.date} at {meeting.time} "
+        f"for class {meeting.classroom}. Location: {meeting.location}.",
+    )
+
+
+def _attendance_items(payload, batch_size):
+    records = (
+        Attendance.objects.filter(
+            pk__in=payload["attendance_ids"],
+            status=Attendance.Status.ABSENT,
+            student__parent__isnull=False,
+        )
+        .select_related("student")
+        .order_by("pk")
+    )
+    yield [(record.student.parent_id, f"s{record.student_id}@{record.date}", record) for record in records]
+
+
+def _result_items(payload, batch_size):
+    results = (
+        Result.objects.filter(pk__in=payload["result_ids"], student__parent__isnull=False)
+        .select_related("exam", "student")
+        .order_by("pk")
+    )
+    yield [
+        (
+            result.student.parent_id,
+            # Corrected marks are a new subject; an identical re-submission is not.
+            f"e{result.exam_id}s{result.student_id}@{result.marks:g}/{result.total_marks:g}/{result.grade}",
+            result,
+        )
+        for result in results
+    ]
+
+
+def _meeting_items(payload, batch_size):
+    meeting = Meeting.objects.select_related("classroom").filter(pk=payload["meeting_id"]).first()
+    if meeting is None:
+        return
+    parent_ids = (
+        Student.objects.filter(classroom_id=meeting.classroom_id, parent__isnull=False)
+        .order_by("parent_id")
+        .values_list("parent_id", flat=True)
+        .distinct()
+    )
+    batch = []
+    for parent_id in parent_ids.iterator(chunk_size=batch_size):
+        batch.append((parent_id, f"m{meeting.pk}", meeting))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# kind -> (notification type, item source, digest renderer). Sources yield
+# chunks of (parent_id, subject token, object) tuples.
+HANDLERS = {
+    Kinds.ATTENDANCE: (Notification.Types.ATTENDANCE, _attendance_items, _render_attendance),
+    Kinds.EXAM_RESULT: (Notification.Types.EXAM_RESULT, _result_items, _render_results),
+    Kinds.MEETING: (Notification.Types.MEETING, _meeting_items, _render_meeting),
+}
+
+
+def _notified_subjects(notification_type, parent_ids):
+    """Subject tokens each parent was already notified about within the dedup window."""
+    since = timezone.now() - datetime.timedelta(days=getattr(settings, "NOTIFICATION_DEDUP_WINDOW_DAYS", 60))
+    subjects = NotificationSubject.objects.filter(
+        parent_id__in=parent_ids, type=notification_type, date__gte=since
+    ).values_list("parent_id", "subject")
+    seen = defaultdict(set)
+    for parent_id, subject in subjects:
+        seen[parent_id].add(subject)
+    return seen
+
+
+def _digests(notification_type, items, render):
+    """One ``(notification, subject tokens)`` per parent, for what they have not heard about yet."""
+    by_parent = defaultdict(dict)
+    for parent_id, token, obj in items:
+        by_parent[parent_id][token] = obj
+    if connection.features.has_select_for_update:
+        # Two workers expanding events about the same subject would both
+        # pass the check below; lock the parents so the second one waits.
+        # SQLite has a single writer, and a worker whose read went stale
+        # fails on its first write and the event is retried.
+        list(ParentProfile.objects.select_for_update().filter(pk__in=by_parent).order_by("pk").values_list("pk"))
+    seen = _notified_subjects(notification_type, list(by_parent))
+    for parent_id, subjects in by_parent.items():
+        fresh = {token: obj for token, obj in subjects.items() if token not in seen[parent_id]}
+        if not fresh:
+            continue
+        title, message = render(list(fresh.values()))
+        notification = Notification(parent_id=parent_id, type=notification_type, title=title, message=message)
+        yield notification, sorted(fresh)
+
+
+def expand_event(event, batch_size=None):
+    """Create the notifications for ``event`` in batches; returns how many.
+
+    Subjects (an absence, a result, a meeting) a parent was already notified
+    about within ``NOTIFICATION_DEDUP_WINDOW_DAYS`` are skipped, and what is
+    left becomes one digest per parent. Each subject is recorded as a
+    ``NotificationSubject`` for later events to check against.
+    """
+    batch_size = batch_size or getattr(settings, "NOTIFICATION_OUTBOX_BATCH_SIZE", 500)
+    notification_type, source, render = HANDLERS[event.kind]
+    created = 0
+    for items in source(event.payload, batch_size):
+        digests = list(_digests(notification_type, items, render))
+        notifications = Notification.objects.bulk_create(
+            [notification for notification, _tokens in digests], batch_size=batch_size
+        )
+        NotificationSubject.objects.bulk_create(
+            [
+                NotificationSubject(
+                    notification=notification,
+                    parent_id=notification.parent_id,
+                    type=notification_type,
+                    subject=token,
+                    date=notification.date,
+                )
+                for notification, tokens in digests
+                for token in tokens
+            ],
+            batch_size=batch_size,
+        )
+        add_unread(Counter(notification.parent_id for notification in notifications))
+        created += len(notifications)
+    return created
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_events(limit=50, worker_id=None, ids=None):
+    """Mark up to ``limit`` due events as being processed by ``worker_id``.
+
+    Uses ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database supports
+    it. Elsewhere (SQLite) the claim is a conditional ``UPDATE`` that only
+    succeeds for rows still claimable, so two workers never get the same
+    event.
+    """
+    worker_id = worker_id or default_worker_id()
+    now = timezone.now()
+    claimable = Q(state=States.PENDING, available_at__lte=now) | Q(
+        state=States.PROCESSING, claimed_at__lt=now - CLAIM_TIMEOUT
+    )
+    candidates = NotificationOutbox.objects.filter(claimable).order_by("pk")
+    if ids is not None:
+        candidates = candidates.filter(pk__in=ids)
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        pks = list(candidates.values_list("pk", flat=True)[:limit])
+        NotificationOutbox.objects.filter(claimable, pk__in=pks).update(
+            state=States.PROCESSING,
+            claimed_by=worker_id,
+            claimed_at=now,
+            attempts=F("attempts") + 1,
+        )
+    return list(
+        NotificationOutbox.objects.filter(
+            pk__in=pks, state=States.PROCESSING, claimed_by=worker_id, claimed_at=now
+        )
+    )
+
+
+def _retry_delay(attempts):
+    return datetime.timedelta(seconds=min(2 ** attempts * 5, 3600))
+
+
+def process_events(events, batch_size=None, max_attempts=None):
+    """Expand claimed events, one transaction each.
+
+    A failing event is put back with exponential backoff until it has been
+    attempted ``max_attempts`` times, then marked failed. Returns progress
+    counters for the run.
+    """
+    max_attempts = max_attempts or getattr(settings, "NOTIFICATION_OUTBOX_MAX_ATTEMPTS", 5)
+    metrics = {"claimed": len(events), "done": 0, "retried": 0, "failed": 0, "notifications": 0}
+    for event in events:
+        try:
+            with transaction.atomic():
+                created = expand_event(event, batch_size)
+                event.state = States.DONE
+                event.notifications_created = created
+                event.processed_at = timezone.now()
+                event.last_error = ""
+                event.save(update_fields=["state", "notifications_created", "processed_at", "last_error"])
+        except Exception as exc:  # noqa: BLE001 - any failure is recorded and retried
+            event.last_error = f"{type(exc).__name__}: {exc}"
+            if event.attempts >= max_attempts:
+                event.state = States.FAILED
+                metrics["failed"] += 1
+            else:
+                event.state = States.PENDING
+                event.available_at = timezone.now() + _retry_delay(event.attempts)
+                metrics["retried"] += 1
+            event.save(update_fields=["state", "available_at", "last_error"])
+            continue
+        metrics["done"] += 1
+        metrics["notifications"] += created
+    return metrics
+
+
+def backlog():
+    """Number of events per state, for monitoring."""
+    counts = dict.fromkeys(States.values, 0)
+    for row in NotificationOutbox.objects.order_by().values("state").annotate(count=Count("id")):
+        counts[row["state"]] = row["count"]
+    return counts
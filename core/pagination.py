@@ -0,0 +1,40 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor (keyset) pagination, applied when the client asks for a page.
+
+    Requests carrying ``?page_size=`` or ``?cursor=`` get a
+    ``{"next", "previous", "results"}`` envelope. Other requests still
+    receive the full list, so existing clients keep working.
+
+    Views choose the key with a ``keyset_ordering`` attribute. The first
+    field is the cursor position and should be backed by an index that
+    matches the view's filter, so each page is one index range scan however
+    deep the client has paged.
+    """
+
+    ordering = ("id",)
+    page_size = None
+    default_page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    def get_page_size(self, request):
+        params = request.query_params
+        if self.page_size_query_param not in params and self.cursor_query_param not in params:
+            return None
+        return super().get_page_size(request) or self.default_page_size
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "keyset_ordering", None)
+        if ordering is None:
+            return super().get_ordering(request, queryset, view)
+        return tuple(ordering)
+
+
+class RequiredKeysetPagination(KeysetPagination):
+    """``KeysetPagination`` that always pages, for listings with no size bound."""
+
+    def get_page_size(self, request):
+        return super().get_page_size(request) or self.default_page_size
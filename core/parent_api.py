@@ -30,9 +30,7 @@ class ParentAdminSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         phone = validated_data.pop("phone", "")
         address = validated_data.pop("address", "")
-        user = User.objects.create_user(**validated_data)
-        user.role = "PARENT"
-        user.save(update_fields=["role"])
+        user = User.objects.create_user(role=User.Roles.PARENT, **validated_data)
         ParentProfile.objects.create(user=user, phone=phone, address=address)
         return user
 
@@ -46,6 +44,9 @@ class ParentAdminListCreateView(generics.ListCreateAPIView):
 
     def list(self, request, *args, **kwargs):
         profiles = self.get_queryset()
+        page = self.paginate_queryset(profiles)
+        if page is not None:
+            profiles = page
         data = []
         for profile in profiles:
             user = profile.user
@@ -60,6 +61,8 @@ class ParentAdminListCreateView(generics.ListCreateAPIView):
                     "address": profile.address,
                 }
             )
+        if page is not None:
+            return self.get_paginated_response(data)
         return Response(data, status=status.HTTP_200_OK)
 
 
@@ -0,0 +1,122 @@
+from django.db import transaction
+from django.db.models import Avg, Count, Exists, F, OuterRef, Window
+from django.db.models.functions import Coalesce, DenseRank, PercentRank, Rank, TruncDate
+
+from .db_router import primary_reads
+from .grading import percentage_expression
+from .models import ExamRank, Result
+
+
+def _percentile(percent_rank):
+    # PERCENT_RANK over a descending order is 0 for the top scorer.
+    return round((1 - percent_rank) * 100, 2)
+
+
+@primary_reads()
+@transaction.atomic(savepoint=False)
+def refresh_exam_ranks(exam_ids):
+    """Recompute the materialized class ranks of every result in ``exam_ids``.
+
+    Ranks are computed by the database with window functions partitioned by
+    exam and classroom, in one query, then upserted in one transaction, so
+    readers never see an exam without ranks and concurrent refreshes of the
+    same exam do not clash. Ranks whose result is gone are deleted. Inside
+    a caller's transaction no savepoint is taken.
+    """
+    exam_ids = set(exam_ids)
+    if not exam_ids:
+        return 0
+
+    def window(expression):
+        return Window(
+            expression,
+            partition_by=[F("exam_id"), F("classroom_id")],
+            order_by=F("score").desc(),
+        )
+
+    ranked = (
+        Result.objects.filter(exam_id__in=exam_ids)
+        .annotate(score=percentage_expression())
+        .annotate(
+            rank=window(Rank()),
+            dense_rank=window(DenseRank()),
+            percent_rank=window(PercentRank()),
+            class_size=Window(Count("id"), partition_by=[F("exam_id"), F("classroom_id")]),
+        )
+        .values(
+            "exam_id",
+            "student_id",
+            "classroom_id",
+            "score",
+            "rank",
+            "dense_rank",
+            "percent_rank",
+            "class_size",
+        )
+    )
+    ranks = [
+        ExamRank(
+            exam_id=row["exam_id"],
+            student_id=row["student_id"],
+            classroom_id=row["classroom_id"],
+            score=row["score"],
+            rank=row["rank"],
+            dense_rank=row["dense_rank"],
+            percentile=_percentile(row["percent_rank"]),
+            class_size=row["class_size"],
+        )
+        for row in ranked
+    ]
+    ExamRank.objects.bulk_create(
+        ranks,
+        update_conflicts=True,
+        unique_fields=["exam", "student"],
+        update_fields=["classroom", "score", "rank", "dense_rank", "percentile", "class_size"],
+    )
+    ExamRank.objects.filter(exam_id__in=exam_ids).exclude(
+        Exists(Result.objects.filter(exam_id=OuterRef("exam_id"), student_id=OuterRef("student_id")))
+    ).delete()
+    return len(ranks)
+
+
+def rebuild_exam_ranks(batch_size=200):
+    """Recompute the ranks of every exam with results, ``batch_size`` exams at a time."""
+    exam_ids = list(Result.objects.order_by("exam_id").values_list("exam_id", flat=True).distinct())
+    rebuilt = 0
+    for offset in range(0, len(exam_ids), batch_size):
+        rebuilt += refresh_exam_ranks(exam_ids[offset:offset + batch_size])
+    return rebuilt
+
+
+def term_ranks(classroom_id, term_start):
+    """Rank every student of a classroom by average percentage across the term.
+
+    An exam belongs to the term by its date, or by when its results were
+    entered if it has no date. Returns ``{student_id: row}`` from a single
+    grouped window query.
+    """
+    rows = (
+        Result.objects.filter(classroom_id=classroom_id)
+        .annotate(taken_on=Coalesce("exam__date", TruncDate("created_at")))
+        .filter(taken_on__gte=term_start)
+        .values("student_id")
+        .annotate(score=Avg(percentage_expression()), exams=Count("id"))
+        .annotate(
+            rank=Window(Rank(), order_by=F("score").desc()),
+            dense_rank=Window(DenseRank(), order_by=F("score").desc()),
+            percent_rank=Window(PercentRank(), order_by=F("score").desc()),
+            class_size=Window(Count("student_id")),
+        )
+        .order_by("rank")
+    )
+    return {
+        row["student_id"]: {
+            "score": round(row["score"], 2),
+            "exams": row["exams"],
+            "rank": row["rank"],
+            "dense_rank": row["dense_rank"],
+            "percentile": _percentile(row["percent_rank"]),
+            "class_size": row["class_size"],
+        }
+        for row in rows
+    }
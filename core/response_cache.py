@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from .versions import ConditionalListMixin
+
+
+# Views using CachedListMixin, by cache name; filled in as they are defined.
+CACHED_VIEWS = set()
+
+
+def _counter_key(name, outcome):
+    return f"response-cache:{outcome}:{name}"
+
+
+def _count(name, outcome):
+    key = _counter_key(name, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def cache_stats():
+    """Hit and miss counts per cached view since the counters were last reset."""
+    stats = {}
+    for name in sorted(CACHED_VIEWS):
+        hits = cache.get(_counter_key(name, "hits"), 0)
+        misses = cache.get(_counter_key(name, "misses"), 0)
+        lookups = hits + misses
+        stats[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+        }
+    return stats
+
+
+def reset_cache_stats():
+    cache.delete_many([_counter_key(name, outcome) for name in CACHED_VIEWS for outcome in ("hits", "misses")])
+
+
+class CachedListMixin(ConditionalListMixin):
+    """Keep serialized listings in Django's cache, per role and query string.
+
+    Entries are keyed by the listing's ETag, which changes whenever a
+    ``post_save``/``post_delete`` signal bumps one of ``version_keys``
+    (see ``core.signals``). A write therefore invalidates every cached
+    variant at once, in every process, without deleting keys; stale
+    entries simply expire after ``RESPONSE_CACHE_TIMEOUT`` seconds.
+    """
+
+    cache_name = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.cache_name:
+            CACHED_VIEWS.add(cls.cache_name)
+
+    def get_list_response(self, request, etag, *args, **kwargs):
+        role = getattr(request.user, "role", "") or "anonymous"
+        key = f"response:{self.cache_name}:{role}:{etag}"
+        data = cache.get(key)
+        if data is not None:
+            _count(self.cache_name, "hits")
+            return Response(data)
+        _count(self.cache_name, "misses")
+        response = super().get_list_response(request, etag, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300))
+        return response
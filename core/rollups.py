@@ -0,0 +1,192 @@
+import datetime
+
+from django.conf import settings
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .db_router import primary_reads
+from .models import Attendance, ClassAttendanceSummary, Student, StudentAttendanceRollup
+
+
+SUMMARY_COUNTS = {
+    "present": Count("id", filter=Q(status=Attendance.Status.PRESENT)),
+    "absent": Count("id", filter=Q(status=Attendance.Status.ABSENT)),
+    "late": Count("id", filter=Q(status=Attendance.Status.LATE)),
+}
+
+
+def _class_day_counts(queryset):
+    return (
+        queryset.order_by()
+        .values("classroom_id", "date")
+        .annotate(**SUMMARY_COUNTS)
+    )
+
+
+def _upsert_summaries(groups, batch_size=None):
+    summaries = [
+        ClassAttendanceSummary(
+            classroom_id=group["classroom_id"],
+            date=group["date"],
+            present=group["present"],
+            absent=group["absent"],
+            late=group["late"],
+        )
+        for group in groups
+    ]
+    ClassAttendanceSummary.objects.bulk_create(
+        summaries,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["classroom", "date"],
+        update_fields=["present", "absent", "late", "updated_at"],
+    )
+    return len(summaries)
+
+
+@primary_reads()
+def refresh_class_summaries(keys):
+    """Recompute the summary rows for the given ``(classroom_id, date)`` pairs.
+
+    Costs one aggregate query and one upsert whatever the number of pairs,
+    plus one ``DELETE`` for the rows of pairs with no attendance left.
+    """
+    keys = set(keys)
+    if not keys:
+        return 0
+    classroom_ids = {classroom_id for classroom_id, _date in keys}
+    dates = {date for _classroom_id, date in keys}
+    groups = [
+        group
+        for group in _class_day_counts(
+            Attendance.objects.filter(classroom_id__in=classroom_ids, date__in=dates)
+        )
+        if (group["classroom_id"], group["date"]) in keys
+    ]
+
+    emptied = {}
+    for classroom_id, date in keys - {(group["classroom_id"], group["date"]) for group in groups}:
+        emptied.setdefault(classroom_id, set()).add(date)
+    if emptied:
+        condition = Q()
+        for classroom_id, empty_dates in emptied.items():
+            condition |= Q(classroom_id=classroom_id, date__in=empty_dates)
+        ClassAttendanceSummary.objects.filter(condition).delete()
+    return _upsert_summaries(groups)
+
+
+def rebuild_class_summaries(start=None, end=None, batch_size=500):
+    """Recompute every summary row, optionally limited to a date range."""
+    attendance = Attendance.objects.all()
+    summaries = ClassAttendanceSummary.objects.all()
+    if start:
+        attendance = attendance.filter(date__gte=start)
+        summaries = summaries.filter(date__gte=start)
+    if end:
+        attendance = attendance.filter(date__lte=end)
+        summaries = summaries.filter(date__lte=end)
+    summaries.delete()
+    return _upsert_summaries(_class_day_counts(attendance).iterator(), batch_size=batch_size)
+
+
+def current_term_start(today=None):
+    """First day of the current term.
+
+    Uses ``settings.ATTENDANCE_TERM_START`` (YYYY-MM-DD) when set, otherwise
+    January 1st of the current year.
+    """
+    configured = getattr(settings, "ATTENDANCE_TERM_START", None)
+    if configured:
+        return parse_date(str(configured))
+    today = today or timezone.localdate()
+    return datetime.date(today.year, 1, 1)
+
+
+@primary_reads()
+def refresh_student_rollups(student_ids, term_start=None):
+    """Recompute the attendance rollups for ``student_ids``.
+
+    Costs two aggregate queries and one upsert whatever the number of
+    students.
+    """
+    student_ids = set(student_ids)
+    if not student_ids:
+        return 0
+    term_start = term_start or current_term_start()
+
+    def term_count(status):
+        return Count(
+            "attendance_records",
+            filter=Q(attendance_records__date__gte=term_start, attendance_records__status=status),
+        )
+
+    counts = (
+        Student.objects.filter(pk__in=student_ids)
+        .annotate(
+            present=term_count(Attendance.Status.PRESENT),
+            absent=term_count(Attendance.Status.ABSENT),
+            late=term_count(Attendance.Status.LATE),
+            last_absent_date=Max(
+                "attendance_records__date",
+                filter=Q(attendance_records__status=Attendance.Status.ABSENT),
+            ),
+        )
+        .values("id", "present", "absent", "late", "last_absent_date")
+    )
+
+    # The current streak is every absence after the student's most recent
+    # non-absent mark (or all of them if there is none).
+    last_attended = (
+        Attendance.objects.filter(student_id=OuterRef("student_id"))
+        .exclude(status=Attendance.Status.ABSENT)
+        .order_by("-date")
+        .values("date")[:1]
+    )
+    streaks = dict(
+        Attendance.objects.filter(student_id__in=student_ids, status=Attendance.Status.ABSENT)
+        .annotate(last_attended=Subquery(last_attended))
+        .filter(Q(last_attended__isnull=True) | Q(date__gt=F("last_attended")))
+        .order_by()
+        .values("student_id")
+        .annotate(streak=Count("id"))
+        .values_list("student_id", "streak")
+    )
+
+    rollups = [
+        StudentAttendanceRollup(
+            student_id=row["id"],
+            term_start=term_start,
+            present=row["present"],
+            absent=row["absent"],
+            late=row["late"],
+            current_absence_streak=streaks.get(row["id"], 0),
+            last_absent_date=row["last_absent_date"],
+        )
+        for row in counts
+    ]
+    StudentAttendanceRollup.objects.bulk_create(
+        rollups,
+        update_conflicts=True,
+        unique_fields=["student"],
+        update_fields=[
+            "term_start",
+            "present",
+            "absent",
+            "late",
+            "current_absence_streak",
+            "last_absent_date",
+            "updated_at",
+        ],
+    )
+    return len(rollups)
+
+
+def rebuild_student_rollups(batch_size=500):
+    """Recompute the rollup of every student, ``batch_size`` students at a time."""
+    term_start = current_term_start()
+    student_ids = list(Student.objects.order_by("pk").values_list("pk", flat=True))
+    rebuilt = 0
+    for offset in range(0, len(student_ids), batch_size):
+        rebuilt += refresh_student_rollups(student_ids[offset:offset + batch_size], term_start)
+    return rebuilt
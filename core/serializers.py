@@ -1,14 +1,21 @@
+from collections.abc import Mapping
+
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 
 from .models import (
     ClassRoom,
     ParentProfile,
     Student,
+    StudentAttendanceRollup,
     Attendance,
+    ClassAttendanceSummary,
     Exam,
+    ExamRank,
     Result,
     Meeting,
+    ArchivedNotification,
     Notification,
 )
 
@@ -87,13 +94,138 @@ class AttendanceSerializer(serializers.ModelSerializer):
         read_only_fields = ["marked_by", "created_at"]
 
 
+class AttendanceFlatSerializer(serializers.ModelSerializer):
+    """Attendance row that refers to its student by id (``?shape=flat``)."""
+
+    class Meta:
+        model = Attendance
+        fields = ["id", "student", "date", "status", "marked_by", "created_at"]
+        read_only_fields = fields
+
+
+class BatchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field that resolves against a lookup prepared by its list serializer.
+
+    Used as a child field of a serializer whose ``list_serializer_class`` is
+    ``BatchedListSerializer``; on its own it behaves like a plain
+    ``PrimaryKeyRelatedField``.
+    """
+
+    def to_internal_value(self, data):
+        list_serializer = getattr(self.parent, "parent", None)
+        resolved = getattr(list_serializer, "_resolved", {}).get(self.field_name)
+        if resolved is None:
+            return super().to_internal_value(data)
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = self.get_queryset().model._meta.pk.to_python(data)
+        except (DjangoValidationError, TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return resolved[pk]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+
+
+class BatchedListSerializer(serializers.ListSerializer):
+    """List serializer that loads every related object in the payload up front.
+
+    Each ``BatchedPrimaryKeyRelatedField`` on the child gets one ``IN`` query
+    for all ids across the rows, instead of one ``get()`` per row. Per-row
+    errors keep the same shape as ``PrimaryKeyRelatedField``.
+    """
+
+    def to_internal_value(self, data):
+        self._resolved = {}
+        if isinstance(data, list):
+            for name, field in self.child.fields.items():
+                if field.read_only or not isinstance(field, BatchedPrimaryKeyRelatedField):
+                    continue
+                queryset = field.get_queryset()
+                pks = set()
+                for row in data:
+                    if not isinstance(row, Mapping):
+                        continue
+                    value = row.get(name)
+                    if value is None or isinstance(value, bool):
+                        continue
+                    try:
+                        pks.add(queryset.model._meta.pk.to_python(value))
+                    except (DjangoValidationError, TypeError, ValueError):
+                        continue
+                self._resolved[name] = queryset.in_bulk(pks)
+        return super().to_internal_value(data)
+
+
+class ClassAttendanceSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ClassAttendanceSummary
+        fields = ["classroom_id", "date", "present", "absent", "late"]
+
+
+class StudentAttendanceRollupSerializer(serializers.ModelSerializer):
+    # LATE counts as attended.
+    attendance_percentage = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = StudentAttendanceRollup
+        fields = [
+            "student_id",
+            "term_start",
+            "present",
+            "absent",
+            "late",
+            "attendance_percentage",
+            "current_absence_streak",
+            "last_absent_date",
+        ]
+
+
+class DashboardResultSerializer(serializers.ModelSerializer):
+    exam_name = serializers.CharField(source="exam.name", read_only=True)
+    subject = serializers.CharField(source="exam.subject", read_only=True)
+    exam_date = serializers.DateField(source="exam.date", read_only=True)
+
+    class Meta:
+        model = Result
+        fields = ["exam_id", "exam_name", "subject", "exam_date", "marks", "total_marks", "grade", "created_at"]
+
+
+class DashboardChildSerializer(serializers.ModelSerializer):
+    """A parent's child with the figures the dashboard shows.
+
+    Expects ``latest_attendance_date``/``latest_attendance_status``
+    annotations and a ``recent_results`` list set by the view.
+    """
+
+    classroom = ClassRoomSerializer(read_only=True)
+    latest_attendance = serializers.SerializerMethodField()
+    attendance = StudentAttendanceRollupSerializer(source="attendance_rollup", read_only=True)
+    recent_results = DashboardResultSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Student
+        fields = ["id", "name", "roll_number", "classroom", "latest_attendance", "attendance", "recent_results"]
+
+    def get_latest_attendance(self, obj):
+        if obj.latest_attendance_date is None:
+            return None
+        return {"date": obj.latest_attendance_date, "status": obj.latest_attendance_status}
+
+
 class AttendanceBulkCreateSerializer(serializers.Serializer):
-    student_id = serializers.PrimaryKeyRelatedField(
-        queryset=Student.objects.all(), source="student"
+    student_id = BatchedPrimaryKeyRelatedField(
+        queryset=Student.objects.select_related("parent", "classroom"), source="student"
     )
     date = serializers.DateField()
     status = serializers.ChoiceField(choices=Attendance.Status.choices)
 
+    class Meta:
+        list_serializer_class = BatchedListSerializer
+
 
 class ExamSerializer(serializers.ModelSerializer):
     classroom = ClassRoomSerializer(read_only=True)
@@ -134,18 +266,54 @@ class ResultSerializer(serializers.ModelSerializer):
         read_only_fields = ["created_by", "created_at"]
 
 
+class ResultFlatSerializer(serializers.ModelSerializer):
+    """Result row that refers to its exam and student by id (``?shape=flat``)."""
+
+    class Meta:
+        model = Result
+        fields = [
+            "id",
+            "exam",
+            "student",
+            "marks",
+            "total_marks",
+            "grade",
+            "remarks",
+            "created_by",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+
+class ExamRankSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ExamRank
+        fields = ["exam_id", "classroom_id", "score", "rank", "dense_rank", "percentile", "class_size"]
+
+
 class ResultBulkCreateSerializer(serializers.Serializer):
-    exam_id = serializers.PrimaryKeyRelatedField(
-        queryset=Exam.objects.all(), source="exam"
+    exam_id = BatchedPrimaryKeyRelatedField(
+        queryset=Exam.objects.select_related("classroom"), source="exam"
     )
-    student_id = serializers.PrimaryKeyRelatedField(
-        queryset=Student.objects.all(), source="student"
+    student_id = BatchedPrimaryKeyRelatedField(
+        queryset=Student.objects.select_related("parent", "classroom"), source="student"
     )
     marks = serializers.FloatField()
     total_marks = serializers.FloatField()
-    grade = serializers.CharField(max_length=5)
+    # Only optional when the view grades on the server (``auto_grade`` context).
+    grade = serializers.CharField(max_length=5, required=False)
     remarks = serializers.CharField(allow_blank=True, required=False)
 
+    class Meta:
+        list_serializer_class = BatchedListSerializer
+
+    def validate(self, attrs):
+        if "grade" not in attrs and not self.context.get("auto_grade"):
+            raise serializers.ValidationError(
+                {"grade": [self.fields["grade"].error_messages["required"]]}
+            )
+        return attrs
+
 
 class MeetingSerializer(serializers.ModelSerializer):
     classroom = ClassRoomSerializer(read_only=True)
@@ -174,3 +342,18 @@ class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = ["id", "type", "title", "message", "date", "is_read"]
+
+
+class ArchivedNotificationSerializer(serializers.ModelSerializer):
+    is_read = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedNotification
+        fields = ["id", "type", "title", "message", "date", "is_read"]
+
+    def get_is_read(self, obj):
+        return True
+
+
+class NotificationIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=1000)
@@ -0,0 +1,82 @@
+from rest_framework.response import Response
+
+from .models import ClassRoom, Exam, Student
+
+
+STUDENT_FIELDS = ("id", "name", "roll_number", "classroom_id", "parent_id")
+CLASSROOM_FIELDS = ("id", "name", "section")
+EXAM_FIELDS = ("id", "name", "subject", "classroom_id", "date")
+
+
+def _by_id(rows):
+    return {row["id"]: row for row in rows}
+
+
+def side_load(rows):
+    """Build the de-duplicated ``students``/``classrooms``/``exams`` maps for ``rows``.
+
+    ``rows`` are model instances exposing ``student_id`` and optionally
+    ``exam_id``. Each map costs one column-limited query no matter how many
+    rows point at the same object.
+    """
+    loaded = {}
+    classroom_ids = set()
+
+    exam_ids = {row.exam_id for row in rows if getattr(row, "exam_id", None)}
+    if exam_ids:
+        exams = _by_id(Exam.objects.filter(pk__in=exam_ids).values(*EXAM_FIELDS))
+        classroom_ids.update(exam["classroom_id"] for exam in exams.values())
+        loaded["exams"] = exams
+
+    student_ids = {row.student_id for row in rows}
+    students = _by_id(Student.objects.filter(pk__in=student_ids).values(*STUDENT_FIELDS)) if student_ids else {}
+    classroom_ids.update(student["classroom_id"] for student in students.values())
+    loaded["students"] = students
+
+    loaded["classrooms"] = (
+        _by_id(ClassRoom.objects.filter(pk__in=classroom_ids).values(*CLASSROOM_FIELDS))
+        if classroom_ids
+        else {}
+    )
+    return loaded
+
+
+class FlatShapeMixin:
+    """Opt-in compact list responses via ``?shape=flat``.
+
+    Rows are serialized with ``flat_serializer_class``, which refers to
+    related objects by id. Only ``flat_fields`` are read for the rows. The
+    related objects are returned once each in side-loaded maps next to the
+    rows, instead of being nested into every row.
+    """
+
+    flat_serializer_class = None
+    flat_fields = ()
+
+    def is_flat(self):
+        return self.request.query_params.get("shape") == "flat"
+
+    def get_serializer_class(self):
+        if self.is_flat():
+            return self.flat_serializer_class
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.is_flat():
+            queryset = queryset.select_related(None).only(*self.flat_fields)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_flat():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+        results = self.get_serializer(rows, many=True).data
+        if page is not None:
+            response = self.get_paginated_response(results)
+        else:
+            response = Response({"results": results})
+        response.data.update(side_load(rows))
+        return response
@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from . import versions
+from .models import ClassRoom, Exam, Meeting, ParentProfile, Student, User
+
+
+VERSIONED_MODELS = {
+    ClassRoom: versions.CLASSROOMS,
+    Student: versions.STUDENTS,
+    ParentProfile: versions.PARENTS,
+    Exam: versions.EXAMS,
+    Meeting: versions.MEETINGS,
+}
+
+
+def bump_resource_version(sender, instance, **kwargs):
+    versions.bump(VERSIONED_MODELS[sender])
+
+
+# Connected per model: a post_delete receiver without a sender would stop
+# Django from fast-deleting every other model (ExamRank, Notification...).
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_resource_version, sender=model)
+    post_delete.connect(bump_resource_version, sender=model)
+
+
+@receiver(post_init, sender=User)
+def remember_role(sender, instance, **kwargs):
+    # Lets bump_parent_version notice a parent whose role changes.
+    if "role" not in instance.get_deferred_fields():
+        instance._loaded_role = instance.role
+
+
+@receiver(post_save, sender=User)
+def bump_parent_version(sender, instance, created=False, update_fields=None, **kwargs):
+    # Parent users are nested in student listings. A new user is not linked
+    # to a student yet, and login bookkeeping changes nothing shown there.
+    was_parent = getattr(instance, "_loaded_role", None) == User.Roles.PARENT
+    instance._loaded_role = instance.role
+    if created or (instance.role != User.Roles.PARENT and not was_parent):
+        return
+    if update_fields is not None and set(update_fields) <= {"last_login", "password"}:
+        return
+    versions.bump(versions.PARENTS)
@@ -25,19 +25,15 @@ class StaffUserSerializer(serializers.ModelSerializer):
         extra_kwargs = {"password": {"write_only": True}}
 
     def create(self, validated_data):
-        password = validated_data.pop("password")
-        role = validated_data.pop("role")
-        user = User.objects.create_user(**validated_data)
-        user.set_password(password)
-        user.role = role
-        user.save(update_fields=["password", "role"])
-        return user
+        # One hash and one INSERT: create_user sets the password and role.
+        return User.objects.create_user(**validated_data)
 
 
 class StaffUserListCreateView(generics.ListCreateAPIView):
     queryset = User.objects.filter(role__in=["PRINCIPAL", "TEACHER", "STAFF"]).order_by("username")
     serializer_class = StaffUserSerializer
     permission_classes = [IsAdminOrPrincipal]
+    keyset_ordering = ("username",)
 
 
 staff_user_view = StaffUserListCreateView.as_view()
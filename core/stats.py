@@ -0,0 +1,87 @@
+import statistics
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Min, Q, StdDev
+
+from .db_router import primary_reads
+from .grading import get_pass_percentage, percentage_expression
+from .models import Result
+
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _cache_key(exam_id):
+    return f"exam-stats:{exam_id}"
+
+
+def compute_exam_stats(exam_id):
+    """Summary statistics for an exam's results, computed on percentages.
+
+    Runs three queries: one aggregate, one ordered fetch of the score column
+    for the median and percentiles, and one grade histogram.
+    """
+    pass_percentage = get_pass_percentage()
+    results = Result.objects.filter(exam_id=exam_id).annotate(score=percentage_expression())
+    summary = results.aggregate(
+        count=Count("id"),
+        mean=Avg("score"),
+        stddev=StdDev("score"),
+        minimum=Min("score"),
+        maximum=Max("score"),
+        mean_marks=Avg("marks"),
+        passed=Count("id", filter=Q(score__gte=pass_percentage)),
+    )
+    scores = list(results.order_by("score").values_list("score", flat=True))
+    histogram = dict(
+        results.order_by("grade").values("grade").annotate(count=Count("id")).values_list("grade", "count")
+    )
+
+    count = summary["count"]
+    if len(scores) > 1:
+        cut_points = statistics.quantiles(scores, n=100, method="inclusive")
+        percentiles = {str(p): round(cut_points[p - 1], 2) for p in PERCENTILES}
+    else:
+        percentiles = {str(p): (round(scores[0], 2) if scores else None) for p in PERCENTILES}
+
+    def rounded(value):
+        return None if value is None else round(value, 2)
+
+    return {
+        "exam_id": exam_id,
+        "count": count,
+        "mean": rounded(summary["mean"]),
+        "median": rounded(statistics.median(scores)) if scores else None,
+        "stddev": rounded(summary["stddev"]),
+        "min": rounded(summary["minimum"]),
+        "max": rounded(summary["maximum"]),
+        "mean_marks": rounded(summary["mean_marks"]),
+        "percentiles": percentiles,
+        "grade_histogram": histogram,
+        "pass_percentage": pass_percentage,
+        "pass_rate": round(summary["passed"] * 100.0 / count, 2) if count else None,
+    }
+
+
+def get_exam_stats(exam_id):
+    """Cached ``compute_exam_stats``; entries are dropped by ``invalidate_exam_stats``.
+
+    Misses are computed on the primary: stats computed from a lagging
+    replica right after a write would be cached for the full timeout.
+    """
+    key = _cache_key(exam_id)
+    stats = cache.get(key)
+    if stats is None:
+        with primary_reads():
+            stats = compute_exam_stats(exam_id)
+        cache.set(key, stats, getattr(settings, "EXAM_STATS_CACHE_TIMEOUT", 3600))
+    return stats
+
+
+def invalidate_exam_stats(exam_ids):
+    """Drop cached stats for ``exam_ids`` once the current transaction commits."""
+    keys = [_cache_key(exam_id) for exam_id in set(exam_ids)]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -1,3 +1,1800 @@
-from django.test import TestCase
+import datetime
+import io
+import os
+import re
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import check_password, is_password_usable
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, connections, transaction
+from django.db.models import F
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import Workbook
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import outbox
+from .accounts import hash_passwords, password_hashing_pool, provision_accounts
+from .auth import ClaimsTokenObtainPairSerializer
+from .bulk import upsert_attendance
+from .coalescer import attendance_writes
+from .db_router import ReplicaRouter, replica_reads
+from .middleware import ReplicaRoutingMiddleware
+from .models import (
+    ArchivedNotification,
+    Attendance,
+    ClassAttendanceSummary,
+    ClassRoom,
+    Exam,
+    ExamRank,
+    Meeting,
+    Notification,
+    NotificationOutbox,
+    NotificationSubject,
+    ParentProfile,
+    Result,
+    Student,
+    StudentAttendanceRollup,
+    User,
+)
+from .response_cache import cache_stats
+from .ranking import refresh_exam_ranks
+from .rollups import refresh_class_summaries, refresh_student_rollups
+from .serializers import ResultBulkCreateSerializer
+from .stats import get_exam_stats
+from .staff_api import StaffUserListCreateView
+
+
+TODAY = datetime.date(2025, 1, 6)
+
+
+def make_class(name="5", section="A", students=0, with_parents=True):
+    classroom = ClassRoom.objects.create(name=name, section=section)
+    for index in range(students):
+        parent = None
+        if with_parents:
+            user = User.objects.create(username=f"parent-{name}{section}-{index}", role="PARENT")
+            parent = ParentProfile.objects.create(user=user)
+        Student.objects.create(
+            name=f"Student {index}",
+            roll_number=str(index + 1),
+            classroom=classroom,
+            parent=parent,
+        )
+    return classroom
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class TokenClaimsTests(TestCase):
+    def setUp(self):
+        self.classroom = make_class(students=1)
+        self.parent = self.classroom.students.get().parent
+        self.user = self.parent.user
+        self.user.set_password("pw-12345")
+        self.user.save()
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post(
+            reverse("token_obtain_pair"), {"username": self.user.username, "password": "pw-12345"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_tokens_carry_role_and_parent_profile(self):
+        tokens = self.login()
+        access = AccessToken(tokens["access"])
+        self.assertEqual((access["role"], access["parent_profile_id"]), ("PARENT", self.parent.pk))
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("notifications-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('"core_user"' in q["sql"] for q in ctx.captured_queries))
+
+        me = self.client.get(reverse("me")).json()
+        self.assertEqual((me["id"], me["username"], me["role"]), (self.user.pk, self.user.username, "PARENT"))
+
+    def test_role_claims_gate_permissions(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.login()['access']}")
+        self.assertEqual(self.client.get(reverse("attendance-summary")).status_code, 403)
+
+    def test_refresh_picks_up_role_changes(self):
+        tokens = self.login()
+        self.user.role = User.Roles.TEACHER
+        self.user.save()
+        response = self.client.post(reverse("token_refresh"), {"refresh": tokens["refresh"]}, format="json")
+        access = AccessToken(response.json()["access"])
+        self.assertEqual((access["role"], access["parent_profile_id"]), ("TEACHER", None))
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post(reverse("token_refresh"), {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+    def test_tokens_without_claims_fall_back_to_the_database(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+        response = self.client.get(reverse("notifications-list"))
+        self.assertEqual(response.status_code, 200)
+
+
+class AttendanceBulkCreateTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username="teacher", role="TEACHER")
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+        self.url = reverse("attendance-bulk-create")
+
+    def test_creates_and_updates_in_place(self):
+        classroom = make_class(students=3)
+        students = list(classroom.students.order_by("roll_number"))
+        payload = [
+            {"student_id": student.pk, "date": TODAY.isoformat(), "status": "PRESENT"}
+            for student in students
+        ]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        first = {row["student"]["id"]: row for row in response.json()}
+
+        payload[1]["status"] = "ABSENT"
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+
+        self.assertEqual(Attendance.objects.count(), 3)
+        self.assertEqual([row["student"]["id"] for row in data], [s.pk for s in students])
+        self.assertEqual(data[1]["status"], "ABSENT")
+        self.assertEqual(data[1]["marked_by"], self.teacher.pk)
+        for row in data:
+            # Updating keeps the original row identity and creation time.
+            self.assertEqual(row["id"], first[row["student"]["id"]]["id"])
+            self.assertEqual(row["created_at"], first[row["student"]["id"]]["created_at"])
+
+        # Notifications are fanned out by the outbox worker, not the request.
+        self.assertEqual(NotificationOutbox.objects.count(), 1)
+        self.assertFalse(Notification.objects.exists())
+        call_command("process_notification_outbox", stdout=io.StringIO())
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_upsert_query_count_is_flat(self):
+        small = list(make_class(name="1", students=5).students.all())
+        large = list(make_class(name="2", students=60).students.all())
+
+        def run(students):
+            items = [{"student": s, "date": TODAY, "status": "PRESENT"} for s in students]
+            with CaptureQueriesContext(connection) as ctx:
+                upsert_attendance(items, self.teacher.pk)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(run(small), run(large))
+
+    def test_request_query_count_is_flat(self):
+        small = list(make_class(name="1", students=5).students.all())
+        large = list(make_class(name="2", students=60).students.all())
+
+        def run(students):
+            payload = [
+                {"student_id": s.pk, "date": TODAY.isoformat(), "status": "ABSENT"}
+                for s in students
+            ]
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(self.url, payload, format="json")
+            self.assertEqual(response.status_code, 201)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(run(small), run(large))
+
+    def test_reports_missing_students_per_row(self):
+        student = make_class(students=1).students.get()
+        payload = [
+            {"student_id": student.pk, "date": TODAY.isoformat(), "status": "PRESENT"},
+            {"student_id": 9999, "date": TODAY.isoformat(), "status": "PRESENT"},
+            {"student_id": "abc", "date": TODAY.isoformat(), "status": "PRESENT"},
+        ]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            [
+                {},
+                {"student_id": ['Invalid pk "9999" - object does not exist.']},
+                {"student_id": ["Incorrect type. Expected pk value, received str."]},
+            ],
+        )
+        self.assertFalse(Attendance.objects.exists())
+
+
+@override_settings(WRITE_COALESCE_WINDOW_MS=200)
+class WriteCoalescerTests(TransactionTestCase):
+    def setUp(self):
+        attendance_writes.reset_stats()
+
+    def test_concurrent_submissions_share_a_transaction(self):
+        outcomes = {}
+        start = threading.Barrier(6)
+
+        def job(index):
+            ClassRoom.objects.create(name=str(index), section="A")
+            if index == 3:
+                raise ValueError("bad payload")
+            return index
+
+        def submit(index):
+            start.wait()
+            try:
+                outcomes[index] = attendance_writes.submit(lambda: job(index))
+            except ValueError as exc:
+                outcomes[index] = exc
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=submit, args=(index,)) for index in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Every caller gets its own outcome; the failure only rolls back its own savepoint.
+        self.assertIsInstance(outcomes.pop(3), ValueError)
+        self.assertEqual(outcomes, {0: 0, 1: 1, 2: 2, 4: 4, 5: 5})
+        self.assertEqual(sorted(ClassRoom.objects.values_list("name", flat=True)), ["0", "1", "2", "4", "5"])
+
+        stats = attendance_writes.stats()
+        self.assertEqual((stats["jobs"], stats["failed"]), (6, 1))
+        self.assertLess(stats["batches"], 6)
+        self.assertGreater(stats["max_batch_size"], 1)
+        self.assertGreater(stats["max_queue_wait_ms"], 0)
+
+    def test_bulk_create_requests_are_coalesced(self):
+        classroom = make_class(students=4)
+        students = list(classroom.students.order_by("roll_number"))
+        teacher = User.objects.create(username="teacher", role="TEACHER")
+        token = ClaimsTokenObtainPairSerializer.get_token(teacher).access_token
+        responses = {}
+        start = threading.Barrier(len(students))
+
+        def post(student):
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+            payload = [{"student_id": student.pk, "date": TODAY.isoformat(), "status": "ABSENT"}]
+            start.wait()
+            try:
+                responses[student.pk] = client.post(reverse("attendance-bulk-create"), payload, format="json")
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=post, args=(student,)) for student in students]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Each request gets back only its own record.
+        for student in students:
+            response = responses[student.pk]
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual([row["student"]["id"] for row in response.json()], [student.pk])
+        self.assertEqual(Attendance.objects.filter(classroom=classroom, status="ABSENT").count(), 4)
+        self.assertEqual(ClassAttendanceSummary.objects.get(classroom=classroom, date=TODAY).absent, 4)
+        self.assertEqual(NotificationOutbox.objects.count(), 4)
+
+        stats = attendance_writes.stats()
+        self.assertEqual(stats["jobs"], 4)
+        self.assertLess(stats["batches"], 4)
+
+    def test_stats_endpoint(self):
+        principal = User.objects.create(username="principal", role="PRINCIPAL")
+        client = APIClient()
+        client.force_authenticate(principal)
+        attendance_writes.submit(lambda: None)
+        data = client.get(reverse("write-coalescer-stats")).json()
+        self.assertEqual(data["attendance"]["batch_sizes"], {"1": 1})
+        self.assertEqual(data["results"]["jobs"], 0)
+        self.assertEqual(client.delete(reverse("write-coalescer-stats")).status_code, 204)
+        self.assertEqual(attendance_writes.stats()["batches"], 0)
+
+
+class ClassAttendanceSummaryTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username="teacher", role="TEACHER")
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+
+    def submit(self, classroom, statuses, date=TODAY):
+        payload = [
+            {"student_id": s.pk, "date": date.isoformat(), "status": status_value}
+            for s, status_value in zip(classroom.students.order_by("roll_number"), statuses)
+        ]
+        response = self.client.post(reverse("attendance-bulk-create"), payload, format="json")
+        self.assertEqual(response.status_code, 201)
+
+    def counts(self, classroom, date=TODAY):
+        return ClassAttendanceSummary.objects.values_list("present", "absent", "late").get(
+            classroom=classroom, date=date
+        )
+
+    def test_bulk_writes_keep_summary_current(self):
+        classroom = make_class(students=4)
+        self.submit(classroom, ["PRESENT", "PRESENT", "ABSENT", "LATE"])
+        self.assertEqual(self.counts(classroom), (2, 1, 1))
+        self.submit(classroom, ["ABSENT", "ABSENT"])
+        self.assertEqual(self.counts(classroom), (0, 3, 1))
+
+    def test_summary_endpoint_and_rebuild(self):
+        first = make_class(name="1", students=2)
+        second = make_class(name="2", students=3)
+        yesterday = TODAY - datetime.timedelta(days=1)
+        self.submit(first, ["PRESENT", "ABSENT"], date=yesterday)
+        self.submit(second, ["LATE", "LATE", "LATE"])
+        self.submit(first, ["PRESENT", "PRESENT"])
+
+        url = reverse("attendance-summary") + f"?start={yesterday}&end={TODAY}"
+        data = self.client.get(url).json()
+        self.assertEqual(
+            [(row["classroom_id"], row["date"], row["present"], row["absent"], row["late"]) for row in data],
+            [
+                (first.pk, yesterday.isoformat(), 1, 1, 0),
+                (first.pk, TODAY.isoformat(), 2, 0, 0),
+                (second.pk, TODAY.isoformat(), 0, 0, 3),
+            ],
+        )
+        self.assertEqual(self.client.get(reverse("attendance-summary") + "?start=bad").status_code, 400)
+
+        ClassAttendanceSummary.objects.update(present=99)
+        call_command("rebuild_attendance_summary", stdout=io.StringIO())
+        self.assertEqual(self.counts(first), (2, 0, 0))
+        self.assertEqual(self.counts(second), (0, 0, 3))
+
+
+@override_settings(ATTENDANCE_TERM_START="2025-01-01")
+class StudentAttendanceRollupTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username="teacher", role="TEACHER")
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+        self.student = make_class(students=1).students.get()
+
+    def mark(self, day, status_value):
+        payload = [{"student_id": self.student.pk, "date": day.isoformat(), "status": status_value}]
+        self.client.post(reverse("attendance-bulk-create"), payload, format="json")
+
+    def test_rollup_tracks_counts_and_streak(self):
+        days = [datetime.date(2024, 12, 30) + datetime.timedelta(days=n) for n in range(6)]
+        for day, status_value in zip(days, ["ABSENT", "PRESENT", "LATE", "ABSENT", "PRESENT", "ABSENT"]):
+            self.mark(day, status_value)
+        # Correcting an earlier day breaks the current streak in the middle.
+        self.mark(days[4], "ABSENT")
+
+        rollup = StudentAttendanceRollup.objects.get(student=self.student)
+        # The first two days fall before the term start.
+        self.assertEqual((rollup.present, rollup.absent, rollup.late), (0, 3, 1))
+        self.assertEqual(rollup.current_absence_streak, 3)
+        self.assertEqual(rollup.last_absent_date, days[5])
+
+        url = reverse("attendance-student-summary", args=[self.student.pk])
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(url).json()
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(data["attendance_percentage"], 25.0)
+        self.assertEqual(data["current_absence_streak"], 3)
+
+    def test_endpoint_builds_missing_rollup(self):
+        url = reverse("attendance-student-summary", args=[self.student.pk])
+        data = self.client.get(url).json()
+        self.assertEqual(data["attendance_percentage"], None)
+        self.assertEqual(data["current_absence_streak"], 0)
+        self.assertEqual(self.client.get(reverse("attendance-student-summary", args=[999])).status_code, 404)
+
+
+class StudentClassChangeTests(TestCase):
+    def setUp(self):
+        self.principal = User.objects.create(username="principal", role="PRINCIPAL")
+        self.client = APIClient()
+        self.client.force_authenticate(self.principal)
+        self.old = make_class(name="5", students=2)
+        self.new = make_class(name="6", students=1)
+        # Roll number 2 is free in the new class.
+        self.student = self.old.students.get(roll_number="2")
+        self.exam = Exam.objects.create(name="Unit 1", subject="Maths", classroom=self.old)
+        attendance = [
+            {"student_id": s.pk, "date": TODAY.isoformat(), "status": "ABSENT"}
+            for s in Student.objects.all()
+        ]
+        self.client.post(reverse("attendance-bulk-create"), attendance, format="json")
+        results = [
+            {"exam_id": self.exam.pk, "student_id": s.pk, "marks": 40, "total_marks": 50, "grade": "A"}
+            for s in Student.objects.all()
+        ]
+        self.client.post(reverse("results-bulk-create"), results, format="json")
+
+    def test_writes_copy_the_students_classroom(self):
+        self.assertEqual(
+            set(Attendance.objects.values_list("student__classroom_id", "classroom_id")),
+            {(self.old.pk, self.old.pk), (self.new.pk, self.new.pk)},
+        )
+        self.assertFalse(Result.objects.exclude(classroom_id=F("student__classroom_id")).exists())
+
+    def test_class_change_moves_records_and_refreshes_derived_rows(self):
+        response = self.client.patch(
+            reverse("student-detail", args=[self.student.pk]), {"classroom_id": self.new.pk}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(self.student.attendance_records.values_list("classroom_id", flat=True)), {self.new.pk}
+        )
+        self.assertEqual(set(self.student.results.values_list("classroom_id", flat=True)), {self.new.pk})
+
+        summaries = dict(ClassAttendanceSummary.objects.values_list("classroom_id", "absent"))
+        self.assertEqual(summaries, {self.old.pk: 1, self.new.pk: 2})
+        response = self.client.get(reverse("attendance-by-class", args=[self.new.pk]))
+        self.assertEqual(len(response.json()), 2)
+
+        rank = ExamRank.objects.get(student=self.student)
+        self.assertEqual((rank.classroom_id, rank.class_size), (self.new.pk, 2))
+
+    def test_moving_the_last_student_out_clears_the_class_day(self):
+        other = make_class(name="7")
+        student = self.new.students.get()
+        response = self.client.patch(
+            reverse("student-detail", args=[student.pk]), {"classroom_id": other.pk}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        summaries = dict(ClassAttendanceSummary.objects.values_list("classroom_id", "absent"))
+        self.assertEqual(summaries, {self.old.pk: 2, other.pk: 1})
+
+
+class BatchedRelatedFieldTests(TestCase):
+    def test_resolves_all_rows_with_one_query_per_field(self):
+        classroom = make_class(students=20)
+        exam = Exam.objects.create(name="Unit 1", subject="Maths", classroom=classroom)
+        payload = [
+            {"exam_id": exam.pk, "student_id": s.pk, "marks": 40, "total_marks": 50, "grade": "A"}
+            for s in classroom.students.all()
+        ]
+        serializer = ResultBulkCreateSerializer(data=payload, many=True)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(serializer.is_valid())
+            for item in serializer.validated_data:
+                item["student"].parent.user_id
+                item["exam"].classroom.name
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+
+class ResultBulkCreateTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username="teacher", role="TEACHER")
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+        self.url = reverse("results-bulk-create")
+
+    def payload(self, exam, students, marks=45, **extra):
+        return [
+            {"exam_id": exam.pk, "student_id": s.pk, "marks": marks, "total_marks": 50, **extra}
+            for s in students
+        ]
+
+    def test_grade_is_required_unless_auto_graded(self):
+        classroom = make_class(students=1)
+        exam = Exam.objects.create(name="Unit 1", subject="Maths", classroom=classroom)
+        response = self.client.post(self.url, self.payload(exam, classroom.students.all()), format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), [{"grade": ["This field is required."]}])
+
+        response = self.client.post(
+            self.url + "?grading=auto", self.payload(exam, classroom.students.all()), format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()[0]["grade"], "A+")
+
+    def test_upserts_and_query_count_is_flat(self):
+        small = make_class(name="1", students=5)
+        large = make_class(name="2", students=60)
+
+        def run(classroom):
+            exam = Exam.objects.create(name="Unit 1", subject="Maths", classroom=classroom)
+            payload = self.payload(exam, classroom.students.all(), grade="B")
+            self.client.post(self.url, payload, format="json")
+            payload[0]["marks"] = 10
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(self.url, payload, format="json")
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(response.json()[0]["marks"], 10)
+            self.assertEqual(Result.objects.filter(exam=exam).count(), len(payload))
+            return len(ctx.captured_queries)
+
+        self.assertEqual(run(small), run(large))
+
+    @override_settings(GRADING_SCALE=[(50, "PASS"), (0, "FAIL")])
+    def test_regrade_exam_in_one_update(self):
+        classroom = make_class(students=3)
+        exam = Exam.objects.create(name="Unit 1", subject="Maths", classroom=classroom)
+        students = list(classroom.students.order_by("roll_number"))
+        for student, marks in zip(students, [10, 25, 49]):
+            Result.objects.create(exam=exam, student=student, marks=marks, total_marks=50, grade="?")
+        Result.objects.filter(student=students[2]).update(total_marks=0)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse("results-regrade", args=[exam.pk]))
+        self.assertEqual(response.json(), {"exam_id": exam.pk, "updated": 3})
+        self.assertEqual(len(ctx.captured_queries), 2)
+        grades = list(Result.objects.order_by("student__roll_number").values_list("grade", flat=True))
+        self.assertEqual(grades, ["FAIL", "PASS", "FAIL"])
+
+
+class ExamStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create(username="teacher", role="TEACHER")
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+        self.classroom = make_class(students=4)
+        self.exam = Exam.objects.create(name="Unit 1", subject="Maths", classroom=self.classroom)
+        self.url = reverse("exam-stats", args=[self.exam.pk])
+
+    def submit(self, marks):
+        payload = [
+            {"exam_id": self.exam.pk, "student_id": s.pk, "marks": m, "total_marks": 50}
+            for s, m in zip(self.classroom.students.order_by("roll_number"), marks)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("results-bulk-create") + "?grading=auto", payload, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+
+    def test_stats_are_cached_until_results_change(self):
+        self.submit([10, 20, 40, 50])
+        data = self.client.get(self.url).json()
+        self.assertEqual(data["count"], 4)
+        self.assertEqual(data["mean"], 60.0)
+        self.assertEqual(data["median"], 60.0)
+        self.assertEqual(data["stddev"], 31.62)
+        self.assertEqual((data["min"], data["max"]), (20.0, 100.0))
+        self.assertEqual(data["percentiles"]["50"], 60.0)
+        self.assertEqual(data["grade_histogram"], {"A": 1, "A+": 1, "D": 1, "F": 1})
+        self.assertEqual(data["pass_rate"], 75.0)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(self.url).json(), data)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        self.submit([50])
+        self.assertEqual(self.client.get(self.url).json()["mean"], 80.0)
+
+    def test_empty_exam(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual(data["count"], 0)
+        self.assertIsNone(data["median"])
+        self.assertIsNone(data["pass_rate"])
+
+
+@override_settings(ATTENDANCE_TERM_START="2025-01-01")
+class RankingTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username="teacher", role="TEACHER")
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+        self.classroom = make_class(students=4)
+        self.students = list(self.classroom.students.order_by("roll_number"))
+
+    def submit(self, exam, marks):
+        payload = [
+            {"exam_id": exam.pk, "student_id": s.pk, "marks": m, "total_marks": 50, "grade": "-"}
+            for s, m in zip(self.students, marks)
+        ]
+        response = self.client.post(reverse("results-bulk-create"), payload, format="json")
+        self.assertEqual(response.status_code, 201)
+
+    def test_ranks_are_materialized_per_exam_and_term(self):
+        first = Exam.objects.create(name="Unit 1", subject="Maths", classroom=self.classroom, date=TODAY)
+        second = Exam.objects.create(name="Unit 2", subject="Maths", classroom=self.classroom, date=TODAY)
+        self.submit(first, [40, 45, 40, 10])
+        self.submit(second, [50, 10, 40, 20])
+
+        ranks = {
+            r.student_id: (r.rank, r.dense_rank, r.percentile, r.class_size)
+            for r in ExamRank.objects.filter(exam=first)
+        }
+        self.assertEqual(
+            [ranks[s.pk] for s in self.students],
+            [(2, 2, 66.67, 4), (1, 1, 100.0, 4), (2, 2, 66.67, 4), (4, 3, 0.0, 4)],
+        )
+
+        # Re-submitting marks refreshes the exam's ranks.
+        self.submit(first, [50])
+        self.assertEqual(ExamRank.objects.get(exam=first, student=self.students[0]).rank, 1)
+
+        url = reverse("results-student-rank", args=[self.students[0].pk])
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(url + f"?exam={second.pk}").json()
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertEqual([row["exam_id"] for row in data["exams"]], [second.pk])
+        self.assertEqual(data["exams"][0]["rank"], 1)
+        self.assertEqual(data["term"]["rank"], 1)
+        self.assertEqual(data["term"]["exams"], 2)
+        self.assertEqual(data["term"]["class_size"], 4)
+        self.assertEqual(data["term"]["score"], 100.0)
+
+        data = self.client.get(reverse("results-student-rank", args=[self.students[3].pk])).json()
+        self.assertEqual(len(data["exams"]), 2)
+        self.assertEqual(data["term"]["rank"], 4)
+
+    def test_refresh_updates_ranks_in_place(self):
+        exam = Exam.objects.create(name="Unit 1", subject="Maths", classroom=self.classroom, date=TODAY)
+        self.submit(exam, [40, 45, 30, 10])
+        ids = dict(ExamRank.objects.values_list("student_id", "pk"))
+
+        # A failed refresh leaves the previous ranks in place.
+        Result.objects.filter(student=self.students[0]).update(marks=50)
+        with mock.patch.object(ExamRank.objects, "bulk_create", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                refresh_exam_ranks([exam.pk])
+        self.assertEqual(ExamRank.objects.get(student=self.students[0]).rank, 2)
+
+        Result.objects.filter(student=self.students[3]).delete()
+        self.assertEqual(refresh_exam_ranks([exam.pk]), 3)
+        ranks = {rank.student_id: (rank.pk, rank.rank, rank.class_size) for rank in ExamRank.objects.all()}
+        self.assertEqual(
+            ranks,
+            {student.pk: (ids[student.pk], rank, 3) for student, rank in zip(self.students, [1, 2, 3])},
+        )
+
+    def test_results_without_ranks_are_ranked(self):
+        exam = Exam.objects.create(name="Unit 1", subject="Maths", classroom=self.classroom, date=TODAY)
+        for student, marks in zip(self.students, [30, 45]):
+            Result.objects.create(exam=exam, student=student, marks=marks, total_marks=50, grade="-")
+        self.assertFalse(ExamRank.objects.exists())
+
+        data = self.client.get(reverse("results-student-rank", args=[self.students[0].pk])).json()
+        self.assertEqual([(row["exam_id"], row["rank"]) for row in data["exams"]], [(exam.pk, 2)])
+        self.assertEqual(ExamRank.objects.count(), 2)
+
+        ExamRank.objects.all().delete()
+        out = io.StringIO()
+        call_command("rebuild_exam_ranks", stdout=out)
+        self.assertIn("Rebuilt 2 exam ranks", out.getvalue())
+        self.assertEqual(ExamRank.objects.get(student=self.students[1]).rank, 1)
+
+
+class ParentDashboardTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username="teacher", role="TEACHER")
+        self.classroom = make_class(students=3)
+        students = list(self.classroom.students.order_by("roll_number"))
+        self.parent = students[0].parent
+        Student.objects.filter(pk=students[1].pk).update(parent=self.parent)
+        self.children, self.other = students[:2], students[2]
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+        attendance = [
+            {"student_id": s.pk, "date": (TODAY + datetime.timedelta(days=d)).isoformat(), "status": status}
+            for s in students
+            for d, status in enumerate(["PRESENT", "ABSENT"])
+        ]
+        self.client.post(reverse("attendance-bulk-create"), attendance, format="json")
+        for index in range(7):
+            exam = Exam.objects.create(name=f"Unit {index}", subject="Maths", classroom=self.classroom)
+            results = [
+                {"exam_id": exam.pk, "student_id": s.pk, "marks": 40, "total_marks": 50, "grade": "A"}
+                for s in students
+            ]
+            self.client.post(reverse("results-bulk-create"), results, format="json")
+        outbox.process_events(outbox.claim_events())
+        self.client.force_authenticate(self.parent.user)
+
+    def test_returns_only_the_parents_children(self):
+        data = self.client.get(reverse("parent-dashboard")).json()
+        self.assertEqual(data["parent_id"], self.parent.pk)
+        self.assertEqual([child["id"] for child in data["children"]], [s.pk for s in self.children])
+        child = data["children"][0]
+        self.assertEqual(child["classroom"]["id"], self.classroom.pk)
+        self.assertEqual(
+            child["latest_attendance"],
+            {"date": (TODAY + datetime.timedelta(days=1)).isoformat(), "status": "ABSENT"},
+        )
+        self.assertEqual(child["attendance"]["current_absence_streak"], 1)
+        self.assertEqual(
+            [result["exam_name"] for result in child["recent_results"]],
+            ["Unit 6", "Unit 5", "Unit 4", "Unit 3", "Unit 2"],
+        )
+        unread = ParentProfile.objects.get(pk=self.parent.pk).unread_notifications
+        self.assertEqual(data["unread_notifications"], unread)
+        self.assertEqual(len(data["recent_notifications"]), 5)
+
+    def test_query_count_does_not_grow_with_children(self):
+        url = reverse("parent-dashboard")
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        baseline = len(ctx.captured_queries)
+        Student.objects.filter(pk=self.other.pk).update(parent=self.parent)
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(url).json()
+        self.assertEqual(len(data["children"]), 3)
+        self.assertEqual(len(ctx.captured_queries), baseline)
+        self.assertLessEqual(baseline, 4)
+
+    def test_parent_without_profile(self):
+        user = User.objects.create(username="orphan", role="PARENT")
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.get(reverse("parent-dashboard")).json()["children"], [])
+
+
+class NotificationOutboxTests(TestCase):
+    def setUp(self):
+        self.principal = User.objects.create(username="principal", role="PRINCIPAL")
+        self.client = APIClient()
+        self.client.force_authenticate(self.principal)
+        self.classroom = make_class(students=5)
+
+    def create_meeting(self):
+        payload = {
+            "title": "PTM",
+            "date": TODAY.isoformat(),
+            "time": "10:00",
+            "classroom_id": self.classroom.pk,
+            "location": "Hall",
+        }
+        response = self.client.post(reverse("meeting-list"), payload, format="json")
+        self.assertEqual(response.status_code, 201)
+
+    def test_meeting_fan_out_runs_in_worker_batches(self):
+        self.create_meeting()
+        event = NotificationOutbox.objects.get()
+        self.assertEqual(event.state, NotificationOutbox.States.PENDING)
+        self.assertFalse(Notification.objects.exists())
+
+        with CaptureQueriesContext(connection) as ctx:
+            metrics = outbox.process_events(outbox.claim_events(), batch_size=2)
+        inserts = [
+            q for q in ctx.captured_queries
+            if q["sql"].startswith("INSERT") and '"core_notification"' in q["sql"]
+        ]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(metrics["notifications"], 5)
+        self.assertEqual(Notification.objects.filter(type="MEETING").count(), 5)
+        event.refresh_from_db()
+        self.assertEqual((event.state, event.attempts, event.notifications_created), ("DONE", 1, 5))
+
+    def test_claims_do_not_overlap(self):
+        self.create_meeting()
+        self.create_meeting()
+        first = outbox.claim_events(limit=1, worker_id="a")
+        second = outbox.claim_events(limit=5, worker_id="b")
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first[0].pk, second[0].pk)
+        self.assertEqual(outbox.claim_events(worker_id="c"), [])
+
+    def test_failures_are_retried_then_marked_failed(self):
+        self.create_meeting()
+
+        def broken(payload, batch_size):
+            raise RuntimeError("boom")
+            yield
+
+        handler = (Notification.Types.MEETING, broken, None)
+        with mock.patch.dict(outbox.HANDLERS, {NotificationOutbox.Kinds.MEETING: handler}):
+            metrics = outbox.process_events(outbox.claim_events(), max_attempts=2)
+            self.assertEqual(metrics["retried"], 1)
+            event = NotificationOutbox.objects.get()
+            self.assertEqual((event.state, event.last_error), ("PENDING", "RuntimeError: boom"))
+            # Not due again until the backoff has passed.
+            self.assertEqual(outbox.claim_events(), [])
+
+            NotificationOutbox.objects.update(available_at=event.created_at)
+            metrics = outbox.process_events(outbox.claim_events(), max_attempts=2)
+            self.assertEqual(metrics["failed"], 1)
+        self.assertEqual(NotificationOutbox.objects.get().state, "FAILED")
+        self.assertFalse(Notification.objects.exists())
+
+
+class NotificationCoalescingTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username="teacher", role="PRINCIPAL")
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+        # One parent with three children in the same class, plus one other family.
+        self.classroom = make_class(students=4)
+        students = list(self.classroom.students.order_by("roll_number"))
+        self.parent = students[0].parent
+        Student.objects.filter(pk__in=[s.pk for s in students[1:3]]).update(parent=self.parent)
+        self.students = students
+
+    def drain(self):
+        outbox.process_events(outbox.claim_events())
+
+    def test_resubmitted_absence_is_not_notified_twice(self):
+        payload = [{"student_id": self.students[0].pk, "date": TODAY.isoformat(), "status": "ABSENT"}]
+        for _ in range(3):
+            self.client.post(reverse("attendance-bulk-create"), payload, format="json")
+            self.drain()
+        self.assertEqual(self.parent.notifications.count(), 1)
+
+        payload.append({"student_id": self.students[1].pk, "date": TODAY.isoformat(), "status": "ABSENT"})
+        self.client.post(reverse("attendance-bulk-create"), payload, format="json")
+        self.drain()
+        latest = self.parent.notifications.latest("pk")
+        self.assertEqual(self.parent.notifications.count(), 2)
+        self.assertEqual(latest.message, f"Student 1 is absent on {TODAY}.")
+
+    def test_absence_is_news_again_after_the_dedup_window(self):
+        payload = [{"student_id": self.students[0].pk, "date": TODAY.isoformat(), "status": "ABSENT"}]
+        self.client.post(reverse("attendance-bulk-create"), payload, format="json")
+        self.drain()
+        aged = timezone.now() - datetime.timedelta(days=61)
+        Notification.objects.update(date=aged)
+        NotificationSubject.objects.update(date=aged)
+
+        self.client.post(reverse("attendance-bulk-create"), payload, format="json")
+        self.drain()
+        self.assertEqual(self.parent.notifications.count(), 2)
+        self.assertEqual(NotificationOutbox.objects.latest("pk").notifications_created, 1)
+        unread = self.parent.notifications.filter(is_read=False).count()
+        self.assertEqual(ParentProfile.objects.get(pk=self.parent.pk).unread_notifications, unread)
+
+    def test_long_backfill_is_not_notified_twice(self):
+        payload = [
+            {
+                "student_id": self.students[0].pk,
+                "date": (TODAY - datetime.timedelta(days=day)).isoformat(),
+                "status": "ABSENT",
+            }
+            for day in range(20)
+        ]
+        for _ in range(2):
+            self.client.post(reverse("attendance-bulk-create"), payload, format="json")
+            self.drain()
+        self.assertEqual(self.parent.notifications.count(), 1)
+        self.assertEqual(self.parent.notifications.get().subjects.count(), 20)
+
+    def test_results_are_digested_per_parent(self):
+        exam = Exam.objects.create(name="Unit 1", subject="Maths", classroom=self.classroom)
+        payload = [
+            {"exam_id": exam.pk, "student_id": s.pk, "marks": 40, "total_marks": 50, "grade": "A"}
+            for s in self.students
+        ]
+        self.client.post(reverse("results-bulk-create"), payload, format="json")
+        self.client.post(reverse("results-bulk-create"), payload, format="json")
+        self.drain()
+        self.assertEqual(Notification.objects.count(), 2)
+        digest = self.parent.notifications.get()
+        self.assertEqual(digest.title, "Exam Results: Unit 1")
+        self.assertEqual(len(digest.message.splitlines()), 3)
+
+        # A corrected mark is news again, for that child only.
+        payload[1]["marks"] = 45
+        self.client.post(reverse("results-bulk-create"), payload, format="json")
+        self.drain()
+        correction = self.parent.notifications.latest("pk")
+        self.assertEqual(correction.title, "Exam Result: Unit 1")
+        self.assertEqual(correction.message, "Student 1's result for Maths: 45.0/50.0 (Grade A).")
+        self.assertEqual(ParentProfile.objects.get(pk=self.parent.pk).unread_notifications, 2)
+
+    def test_meeting_notifies_each_parent_once(self):
+        payload = {
+            "title": "PTM",
+            "date": TODAY.isoformat(),
+            "time": "10:00",
+            "classroom_id": self.classroom.pk,
+            "location": "Hall",
+        }
+        self.client.post(reverse("meeting-list"), payload, format="json")
+        self.drain()
+        self.assertEqual(self.parent.notifications.count(), 1)
+        self.assertEqual(Notification.objects.count(), 2)
+
+
+class UnreadCounterTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username="teacher", role="TEACHER")
+        self.classroom = make_class(students=2)
+        self.parent = self.classroom.students.order_by("roll_number").first().parent
+        self.client = APIClient()
+
+    def notify(self, days):
+        """Submit one day's absence per request, as a teacher would."""
+        self.client.force_authenticate(self.teacher)
+        student = self.parent.students.get()
+        for day in range(days):
+            date = TODAY + datetime.timedelta(days=day)
+            payload = [{"student_id": student.pk, "date": date.isoformat(), "status": "ABSENT"}]
+            self.client.post(reverse("attendance-bulk-create"), payload, format="json")
+        outbox.process_events(outbox.claim_events())
+        self.client.force_authenticate(self.parent.user)
+
+    def unread(self):
+        return self.client.get(reverse("notifications-unread-count")).json()["unread"]
+
+    def test_counter_follows_inserts_and_reads(self):
+        self.notify(4)
+        self.assertEqual(self.unread(), 4)
+        ids = list(self.parent.notifications.order_by("pk").values_list("pk", flat=True))
+
+        response = self.client.patch(reverse("notification-mark-read", args=[ids[0]]))
+        self.assertTrue(response.json()["is_read"])
+        # Marking an already read notification does not decrement again.
+        self.client.patch(reverse("notification-mark-read", args=[ids[0]]))
+        self.assertEqual(self.unread(), 3)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse("notifications-mark-read"), {"ids": ids[:3]}, format="json")
+        self.assertEqual(response.json(), {"updated": 2, "unread": 1})
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "core_notification"')]
+        self.assertEqual(len(updates), 1)
+
+        # Days already notified are suppressed; only the two new days count.
+        self.notify(6)
+        self.assertEqual(self.unread(), 3)
+        response = self.client.post(reverse("notifications-mark-all-read"))
+        self.assertEqual(response.json(), {"updated": 3, "unread": 0})
+        self.assertFalse(self.parent.notifications.filter(is_read=False).exists())
+
+    def test_ids_are_validated(self):
+        self.client.force_authenticate(self.parent.user)
+        response = self.client.post(reverse("notifications-mark-read"), {"ids": []}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class NotificationArchiveTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username="parent", role="PARENT")
+        self.parent = ParentProfile.objects.create(user=user)
+        now = timezone.now()
+        for i in range(10):
+            # Five old read, two old unread, three recent read.
+            notification = Notification.objects.create(
+                parent=self.parent, type="MEETING", title=f"N{i}", message="m", is_read=i not in (5, 6)
+            )
+            age = datetime.timedelta(days=100 + i if i < 7 else 1)
+            Notification.objects.filter(pk=notification.pk).update(date=now - age)
+        ParentProfile.objects.filter(pk=self.parent.pk).update(unread_notifications=2)
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_moves_old_read_notifications_in_batches(self):
+        out = io.StringIO()
+        call_command("archive_notifications", "--batch-size=2", stdout=out)
+        self.assertIn("Archived 5 notifications", out.getvalue())
+        self.assertIn("in 3 batches", out.getvalue())
+        self.assertEqual(
+            sorted(self.parent.notifications.values_list("title", flat=True)),
+            ["N5", "N6", "N7", "N8", "N9"],
+        )
+        archived = ArchivedNotification.objects.order_by("title")
+        self.assertEqual([a.title for a in archived], ["N0", "N1", "N2", "N3", "N4"])
+        self.assertEqual(ParentProfile.objects.get(pk=self.parent.pk).unread_notifications, 2)
+
+        # Re-running finds nothing left.
+        out = io.StringIO()
+        call_command("archive_notifications", stdout=out)
+        self.assertIn("Archived 0 notifications", out.getvalue())
+
+    def test_retention_never_undercuts_dedup_window(self):
+        call_command("archive_notifications", "--days=1", stdout=io.StringIO())
+        self.assertEqual(ArchivedNotification.objects.count(), 5)
+
+    def test_history_is_paginated(self):
+        call_command("archive_notifications", stdout=io.StringIO())
+        url = reverse("notifications-history")
+        data = self.client.get(url).json()
+        self.assertEqual([row["title"] for row in data["results"]], ["N0", "N1", "N2", "N3", "N4"])
+        self.assertTrue(all(row["is_read"] for row in data["results"]))
+
+        seen = []
+        url += "?page_size=2"
+        while url:
+            data = self.client.get(url).json()
+            seen.extend(row["title"] for row in data["results"])
+            url = data["next"]
+        self.assertEqual(seen, ["N0", "N1", "N2", "N3", "N4"])
+
+        other = User.objects.create(username="other", role="PARENT")
+        ParentProfile.objects.create(user=other)
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(reverse("notifications-history")).json()["results"], [])
+
+
+class SQLiteBenchmarkTests(TestCase):
+    def test_compares_profiles_on_a_scratch_file(self):
+        out = io.StringIO()
+        call_command("benchmark_sqlite", "--seconds=0.2", "--writers=2", "--readers=2", "--classes=2", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual([line.split()[0] for line in lines[2:]], ["default", "production"])
+        production = lines[3].split()
+        self.assertGreater(float(production[1]), 0)
+        self.assertEqual(production[3], "0")
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class ImportTests(TestCase):
+    def setUp(self):
+        self.classroom = make_class(name="5", section="A", students=1, with_parents=False)
+        User.objects.create(username="taken", role="PARENT")
+        principal = User.objects.create(username="principal", role="PRINCIPAL")
+        self.client = APIClient()
+        self.client.force_authenticate(principal)
+
+    def upload(self, kind, content, name="data.csv"):
+        upload = SimpleUploadedFile(name, content if isinstance(content, bytes) else content.encode())
+        return self.client.post(reverse("import", args=[kind]), {"file": upload}, format="multipart")
+
+    def test_parents_are_created_and_bad_rows_reported(self):
+        response = self.upload(
+            "parents",
+            "Username,First_Name,Email,Password,Phone\n"
+            "asha,Asha,asha@example.com,secret123,555\n"
+            "taken,Dup,,,\n"
+            "\n"
+            "ravi,Ravi,not-an-email,,\n"
+            "asha,Again,,,\n"
+            "meena,Meena,,,\n",
+        )
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self.assertEqual((report["rows"], report["created"], report["failed"]), (5, 2, 3))
+        self.assertEqual([error["row"] for error in report["errors"]], [3, 5, 6])
+        self.assertIn("email", report["errors"][1]["errors"])
+
+        asha = User.objects.get(username="asha")
+        self.assertEqual((asha.role, asha.first_name, asha.parent_profile.phone), ("PARENT", "Asha", "555"))
+        self.assertTrue(asha.check_password("secret123"))
+        self.assertFalse(User.objects.get(username="meena").has_usable_password())
+
+    def test_students_resolve_class_and_parent(self):
+        parent = ParentProfile.objects.create(user=User.objects.create(username="asha", role="PARENT"))
+        rows = [
+            "name,roll_number,class_name,section,parent_username",
+            "Kiran,2,5,a,asha",
+            "Nobody,3,9,Z,",
+            "Clash,1,5,A,",
+            "Dev,4,5,A,ghost",
+            "Lata,5,5,A,",
+            "Twice,5,5,A,",
+        ]
+        path = self.tmp_csv(rows)
+        out, err = io.StringIO(), io.StringIO()
+        # The class map once, then per chunk: parents, roll numbers and the
+        # savepoint-wrapped insert plus version bump.
+        with self.assertNumQueries(13):
+            call_command("import_records", "students", path, "--chunk-size=3", stdout=out, stderr=err)
+        self.assertIn("Imported 2 of 6 students (4 rows failed)", out.getvalue())
+        self.assertEqual(
+            [line.split(":")[0] for line in err.getvalue().splitlines()], ["row 3", "row 4", "row 5", "row 7"]
+        )
+        kiran = Student.objects.get(name="Kiran")
+        self.assertEqual((kiran.classroom_id, kiran.parent_id), (self.classroom.pk, parent.pk))
+        self.assertTrue(Student.objects.filter(name="Lata").exists())
+
+    def tmp_csv(self, rows):
+        handle = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+        self.addCleanup(os.unlink, handle.name)
+        with handle:
+            handle.write("\n".join(rows) + "\n")
+        return handle.name
+
+    def test_xlsx_upload(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(["Name", "Roll_Number", "Class_Name", "Section"])
+        sheet.append(["Kiran", 2, 5, "A"])
+        sheet.append([None, None, None, None])
+        sheet.append(["Nobody", 3, 9, "Z"])
+        content = io.BytesIO()
+        workbook.save(content)
+        upload = SimpleUploadedFile("students.xlsx", content.getvalue())
+        response = self.client.post(reverse("import", args=["students"]), {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self.assertEqual((report["created"], report["failed"]), (1, 1))
+        self.assertEqual(report["errors"][0]["row"], 4)
+        self.assertEqual(Student.objects.get(name="Kiran").roll_number, "2")
+
+        response = self.upload("students", "not a workbook", name="students.xlsx")
+        self.assertEqual(response.status_code, 400)
+
+    def test_unreadable_files_are_rejected(self):
+        response = self.upload("students", "name,roll_number\nA,1\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Missing columns: class_name, section.", response.json()["file"][0])
+        self.assertEqual(self.upload("students", "x", name="data.pdf").status_code, 400)
+        self.assertEqual(self.upload("teachers", "username\n").status_code, 404)
+
+    @override_settings(IMPORT_CHUNK_SIZE=1)
+    def test_undecodable_csv_is_rejected_before_any_row_is_written(self):
+        latin1 = b"name,roll_number,class_name,section\nKiran,2,5,A\nJos\xe9,3,5,A\n"
+        response = self.upload("students", latin1)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("not UTF-8", response.json()["file"][0])
+
+        oversized = "name,roll_number,class_name,section\nKiran,2,5,A\n" + "x" * 200_000 + ",3,5,A\n"
+        response = self.upload("students", oversized)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Line 3 is not valid CSV", response.json()["file"][0])
+        self.assertFalse(Student.objects.filter(name="Kiran").exists())
+
+        path = self.tmp_csv([])
+        with open(path, "wb") as handle:
+            handle.write(latin1)
+        with self.assertRaisesMessage(CommandError, "not UTF-8"):
+            call_command("import_records", "students", path, stdout=io.StringIO())
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class AccountProvisioningTests(TestCase):
+    def test_parallel_hashes_match_make_password(self):
+        passwords = ["alpha", "", "beta", None, "alpha"]
+        with password_hashing_pool(2) as pool:
+            hashed = hash_passwords(passwords, pool)
+        self.assertTrue(check_password("alpha", hashed[0]))
+        self.assertTrue(check_password("beta", hashed[2]))
+        self.assertFalse(is_password_usable(hashed[1]))
+        self.assertFalse(is_password_usable(hashed[3]))
+        # Every password gets its own salt.
+        self.assertNotEqual(hashed[0], hashed[4])
+
+    def test_provisions_users_and_profiles_in_bulk(self):
+        accounts = [{"username": f"p{index}", "password": f"pw{index}", "phone": str(index)} for index in range(5)]
+        # Users, profiles, the parent version bump and the savepoint pair.
+        with self.assertNumQueries(5):
+            users = provision_accounts(accounts, "PARENT", workers=1)
+        self.assertEqual(ParentProfile.objects.filter(user__in=users).count(), 5)
+        user = User.objects.get(username="p3")
+        self.assertEqual((user.role, user.parent_profile.phone), ("PARENT", "3"))
+        self.assertTrue(user.check_password("pw3"))
+
+    def test_staff_import(self):
+        out = io.StringIO()
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            handle.write("username,role,password\nteach,teacher,pw\nboss,OWNER,pw\n")
+        self.addCleanup(os.unlink, handle.name)
+        call_command("import_records", "staff", handle.name, stdout=out, stderr=io.StringIO())
+        self.assertIn("Imported 1 of 2 staff", out.getvalue())
+        teacher = User.objects.get(username="teach")
+        self.assertEqual(teacher.role, "TEACHER")
+        self.assertTrue(teacher.check_password("pw"))
+        self.assertFalse(hasattr(teacher, "parent_profile"))
+
+    @override_settings(PASSWORD_HASH_WORKERS=2)
+    def test_import_forks_one_pool_per_run(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            handle.write("username,password\na,pw-a\nb,pw-b\nc,pw-c\nd,pw-d\n")
+        self.addCleanup(os.unlink, handle.name)
+        with mock.patch("core.accounts.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as executor:
+            call_command("import_records", "parents", handle.name, "--chunk-size=2", stdout=io.StringIO())
+        executor.assert_called_once_with(max_workers=2)
+        self.assertTrue(User.objects.get(username="d").check_password("pw-d"))
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username="principal", role="PRINCIPAL"))
+        upload = SimpleUploadedFile("parents.csv", b"username,password\ne,pw-e\nf,pw-f\n")
+        with mock.patch("core.accounts.ProcessPoolExecutor") as executor:
+            response = client.post(reverse("import", args=["parents"]), {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 201)
+        executor.assert_not_called()
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username="parent", role="PARENT")
+        self.parent = ParentProfile.objects.create(user=user)
+        Notification.objects.bulk_create(
+            Notification(parent=self.parent, type="MEETING", title=f"N{i}", message="m")
+            for i in range(7)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        self.url = reverse("notifications-list")
+
+    def test_unpaginated_by_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.json()), 7)
+
+    def test_pages_cover_every_row_at_constant_cost(self):
+        seen = []
+        costs = []
+        url = self.url + "?page_size=3"
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                data = self.client.get(url).json()
+            costs.append(len(ctx.captured_queries))
+            seen.extend(row["id"] for row in data["results"])
+            url = data["next"]
+        self.assertEqual(len(costs), 3)
+        self.assertEqual(len(set(costs)), 1)
+        self.assertEqual(sorted(seen), sorted(Notification.objects.values_list("id", flat=True)))
+        self.assertEqual(len(seen), len(set(seen)))
+
+
+class FlatShapeTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username="teacher", role="TEACHER")
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+
+    def test_attendance_flat_shape_side_loads_once(self):
+        classroom = make_class(students=4)
+        Attendance.objects.bulk_create(
+            Attendance(student=s, classroom=classroom, date=TODAY, status="PRESENT")
+            for s in classroom.students.all()
+        )
+        url = reverse("attendance-by-class", args=[classroom.pk]) + "?shape=flat"
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(url).json()
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertEqual(len(data["results"]), 4)
+        self.assertEqual(set(data), {"results", "students", "classrooms"})
+        self.assertEqual(list(data["classrooms"]), [str(classroom.pk)])
+        row = data["results"][0]
+        self.assertEqual(data["students"][str(row["student"])]["classroom_id"], classroom.pk)
+
+    def test_result_flat_shape_paginates_with_side_loads(self):
+        classroom = make_class(students=5)
+        exam = Exam.objects.create(name="Unit 1", subject="Maths", classroom=classroom)
+        Result.objects.bulk_create(
+            Result(exam=exam, student=s, classroom=classroom, marks=1, total_marks=2, grade="C")
+            for s in classroom.students.all()
+        )
+        url = reverse("results-by-exam", args=[exam.pk]) + "?shape=flat&page_size=2"
+        data = self.client.get(url).json()
+        self.assertEqual(len(data["results"]), 2)
+        self.assertIsNotNone(data["next"])
+        self.assertEqual(list(data["exams"]), [str(exam.pk)])
+        self.assertEqual(len(data["students"]), 2)
+
+
+SIZES = (2, 12)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.classroom = make_class(students=2)
+        self.exam = Exam.objects.create(name="Unit 1", subject="Maths", classroom=self.classroom)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username="principal", role="PRINCIPAL"))
+
+    def revalidate(self, url, etag):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        return response, ctx
+
+    def test_unchanged_list_is_not_rebuilt(self):
+        for name in ("classroom-list", "student-list", "exam-list"):
+            url = reverse(name)
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+            self.assertIn("no-cache", first["Cache-Control"])
+            response, ctx = self.revalidate(url, first["ETag"])
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response["ETag"], first["ETag"])
+            self.assertEqual(len(ctx.captured_queries), 1)
+            self.assertIn("core_resourceversion", ctx.captured_queries[0]["sql"])
+
+    def test_writes_change_the_etag(self):
+        url = reverse("student-list")
+        etag = self.client.get(url)["ETag"]
+
+        # A nested object changing invalidates the listing too.
+        ClassRoom.objects.filter(pk=self.classroom.pk).get().save()
+        response, _ = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        parent = self.classroom.students.first().parent
+        parent.user.last_name = "Changed"
+        parent.user.save()
+        response, _ = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.revalidate(url, response["ETag"])[0].status_code, 304)
+
+        # Login bookkeeping is not a change to the listing.
+        parent.user.save(update_fields=["last_login"])
+        self.assertEqual(self.revalidate(url, response["ETag"])[0].status_code, 304)
+
+        # Nor is a change to a staff user, but a parent changing role is.
+        staff = User.objects.create(username="staff", role="STAFF")
+        staff.first_name = "S"
+        staff.save()
+        self.assertEqual(self.revalidate(url, response["ETag"])[0].status_code, 304)
+        user = User.objects.get(pk=parent.user.pk)
+        user.role = "STAFF"
+        user.save(update_fields=["role"])
+        self.assertEqual(self.revalidate(url, response["ETag"])[0].status_code, 200)
+
+    def test_query_string_is_part_of_the_tag(self):
+        url = reverse("exam-list")
+        etag = self.client.get(url)["ETag"]
+        self.assertNotEqual(self.client.get(url + "?page_size=1")["ETag"], etag)
+
+    def test_if_modified_since(self):
+        url = reverse("classroom-list")
+        last_modified = self.client.get(url)["Last-Modified"]
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for target in ("core.db_router.replica_configured", "core.middleware.replica_configured"):
+            patcher = mock.patch(target, return_value=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.router = ReplicaRouter()
+        self.user = User.objects.create(username="teacher", role="TEACHER")
+        token = ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+        self.factory = RequestFactory(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_router_follows_the_block(self):
+        self.assertEqual(self.router.db_for_read(ClassRoom), "default")
+        with replica_reads() as state:
+            self.assertEqual(self.router.db_for_read(ClassRoom), "replica")
+            self.assertEqual(self.router.db_for_write(ClassRoom), "default")
+            # Reads after a write see it.
+            self.assertTrue(state.wrote)
+            self.assertEqual(self.router.db_for_read(ClassRoom), "default")
+        self.assertFalse(self.router.allow_migrate("replica", "core"))
+
+    def run_request(self, method, writes=False):
+        seen = []
+
+        def view(request):
+            seen.append(self.router.db_for_read(ClassRoom))
+            if writes:
+                self.router.db_for_write(ClassRoom)
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(view)(getattr(self.factory, method)("/api/classrooms/"))
+        return seen[0]
+
+    def test_reads_are_pinned_to_the_primary_after_a_write(self):
+        self.assertEqual(self.run_request("get"), "replica")
+        self.assertEqual(self.run_request("post"), "default")
+        self.assertEqual(self.run_request("get"), "default")
+
+        cache.clear()
+        self.assertEqual(self.run_request("get", writes=True), "replica")
+        self.assertEqual(self.run_request("get"), "default")
+
+        with override_settings(READ_YOUR_WRITES_SECONDS=0.01):
+            self.run_request("post")
+        time.sleep(0.05)
+        self.assertEqual(self.run_request("get"), "replica")
+
+
+    def replica_reads_during(self, fn):
+        """Run ``fn`` inside a replica-routed block; returns the models it read from the replica."""
+        replica_models = []
+        db_for_read = ReplicaRouter.db_for_read
+
+        def spy(router, model, **hints):
+            if db_for_read(router, model, **hints) == "replica":
+                replica_models.append(model)
+            # There is no replica database under test.
+            return "default"
+
+        with mock.patch.object(ReplicaRouter, "db_for_read", spy), replica_reads():
+            fn()
+        return replica_models
+
+    def test_rollup_refresh_reads_the_primary(self):
+        classroom = make_class(students=1)
+        student = classroom.students.get()
+        today = timezone.localdate()
+        Attendance.objects.create(student=student, date=today, status="ABSENT")
+        self.assertEqual(self.replica_reads_during(lambda: refresh_student_rollups([student.pk])), [])
+        self.assertEqual(
+            self.replica_reads_during(lambda: refresh_class_summaries([(classroom.pk, today)])), []
+        )
+        rollup = StudentAttendanceRollup.objects.get(student=student)
+        self.assertEqual((rollup.absent, rollup.current_absence_streak), (1, 1))
+
+        # Only the refresh is forced to the primary; other reads may still use the replica.
+        self.assertEqual(self.replica_reads_during(lambda: list(ClassRoom.objects.all())), [ClassRoom])
+
+    def test_exam_stats_are_computed_on_the_primary(self):
+        classroom = make_class(students=1)
+        exam = Exam.objects.create(name="Unit 1", subject="Maths", classroom=classroom)
+        Result.objects.create(exam=exam, student=classroom.students.get(), marks=50, total_marks=100, grade="C")
+        cache.clear()
+        self.assertEqual(self.replica_reads_during(lambda: get_exam_stats(exam.pk)), [])
+        self.assertEqual(get_exam_stats(exam.pk)["count"], 1)
+
+    def test_rollup_view_recomputes_from_the_primary(self):
+        student = make_class(students=1).students.get()
+        Attendance.objects.create(student=student, date=TODAY, status="ABSENT")
+        principal = User.objects.create(username="principal", role="PRINCIPAL")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {ClaimsTokenObtainPairSerializer.get_token(principal).access_token}")
+        url = reverse("attendance-student-summary", args=[student.pk])
+        replica_models = self.replica_reads_during(lambda: client.get(url))
+        self.assertNotIn(Attendance, replica_models)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.classroom = make_class(students=1)
+        self.principal = User.objects.create(username="principal", role="PRINCIPAL")
+        self.teacher = User.objects.create(username="teacher", role="TEACHER")
+        self.client = APIClient()
+        self.client.force_authenticate(self.principal)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        return response, [q["sql"] for q in ctx.captured_queries]
+
+    def test_hits_skip_the_list_query(self):
+        Meeting.objects.create(
+            title="PTM", date=TODAY, time=datetime.time(10), classroom=self.classroom, location="Hall"
+        )
+        url = reverse("meeting-list")
+        first, queries = self.get(url)
+        self.assertTrue(any("core_meeting" in sql for sql in queries))
+        second, queries = self.get(url)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(len(queries), 1)
+        self.assertIn("core_resourceversion", queries[0])
+
+        stats = self.client.get(reverse("cache-stats")).json()
+        self.assertEqual(stats["meetings"], {"hits": 1, "misses": 1, "hit_rate": 0.5})
+        self.assertEqual(self.client.delete(reverse("cache-stats")).status_code, 204)
+        self.assertEqual(self.client.get(reverse("cache-stats")).json()["meetings"]["hits"], 0)
+
+    def test_writes_invalidate_cached_listings(self):
+        url = reverse("exam-list")
+        self.assertEqual(self.get(url)[0].json(), [])
+        exam = Exam.objects.create(name="Unit 1", subject="Maths", classroom=self.classroom)
+        self.assertEqual([row["id"] for row in self.get(url)[0].json()], [exam.pk])
+
+        # Renaming a class changes every exam that nests it.
+        ClassRoom.objects.filter(pk=self.classroom.pk).update(name="6")
+        self.assertEqual(self.get(url)[0].json()[0]["classroom"]["name"], "5")
+        self.classroom.name = "6"
+        self.classroom.save()
+        self.assertEqual(self.get(url)[0].json()[0]["classroom"]["name"], "6")
+
+        exam.delete()
+        self.assertEqual(self.get(url)[0].json(), [])
+
+    def test_entries_are_per_role(self):
+        url = reverse("classroom-list")
+        self.get(url)
+        self.client.force_authenticate(self.teacher)
+        self.get(url)
+        self.assertEqual(cache_stats()["classrooms"]["misses"], 2)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "plans are checked against SQLite's EXPLAIN output")
+class IndexUsageTests(TestCase):
+    """Hot queries are served by an index, never a full table scan."""
+
+    def assertUsesIndex(self, queryset, index, sorted_by_index=True):
+        plan = queryset.explain()
+        self.assertIn(f"INDEX {index}", plan)
+        for line in plan.splitlines():
+            self.assertIsNone(re.search(r"\bSCAN (?!.*\bUSING\b)", line), plan)
+        if sorted_by_index:
+            self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_notifications(self):
+        notifications = Notification.objects.filter(parent_id=1)
+        self.assertUsesIndex(notifications, "notification_parent_date_idx")
+        self.assertUsesIndex(notifications.order_by("-date", "-id")[:51], "notification_parent_date_idx")
+        self.assertUsesIndex(notifications.filter(is_read=False).order_by(), "notification_parent_unread_idx")
+        self.assertUsesIndex(
+            ArchivedNotification.objects.filter(parent_id=1).order_by("-date", "-id"),
+            "archived_notif_parent_date_idx",
+        )
+
+    def test_staff_listing(self):
+        # IN over three roles still needs a small sort of the matching rows.
+        self.assertUsesIndex(
+            StaffUserListCreateView.queryset, "user_role_username_idx", sorted_by_index=False
+        )
+
+    def test_meetings_and_exams_by_class(self):
+        self.assertUsesIndex(
+            Meeting.objects.filter(classroom_id=1, date__gte=TODAY).order_by("date"),
+            "meeting_class_date_idx",
+        )
+        self.assertUsesIndex(
+            Exam.objects.filter(classroom_id=1, date__gte=TODAY).order_by("date"), "exam_class_date_idx"
+        )
+
+    def test_attendance_and_results(self):
+        self.assertUsesIndex(
+            Attendance.objects.filter(classroom_id=1, date=TODAY).order_by(), "attendance_class_date_idx"
+        )
+        self.assertUsesIndex(
+            Attendance.objects.filter(student_id=1).order_by("-date"), "core_attendance_student_id_date"
+        )
+        self.assertUsesIndex(
+            Result.objects.filter(student_id=1).order_by("exam_id"), "result_student_exam_idx"
+        )
+        self.assertUsesIndex(
+            Result.objects.filter(classroom_id=1, exam_id=1).order_by(), "result_class_exam_idx"
+        )
+        self.assertUsesIndex(
+            ClassAttendanceSummary.objects.filter(date__gte=TODAY).order_by("date", "classroom_id"),
+            "class_summary_date_idx",
+        )
+
+
+class QueryBudgetTests(TestCase):
+    """Every route in core/urls.py runs a fixed number of queries.
+
+    Each case seeds a class of ``size`` students (with parents, attendance,
+    results, a meeting and notifications) for every size in ``SIZES``. It
+    asserts that the request issues the same number of queries each time and
+    stays within its budget. On failure, the captured SQL is printed.
+    Requests carry a real access token, so authentication costs are counted.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create(username="admin", role="ADMIN")
+        self.client = APIClient()
+        self.seeded = 0
+
+    def seed(self, size):
+        self.seeded += 1
+        tag = f"s{size}-{self.seeded}"
+        classroom = make_class(name=tag, students=size)
+        students = list(classroom.students.select_related("parent__user"))
+        exam = Exam.objects.create(name="Term", subject="Maths", classroom=classroom, date=TODAY)
+        Attendance.objects.bulk_create(
+            Attendance(
+                student=s, classroom=classroom, date=TODAY - datetime.timedelta(days=day), status="PRESENT"
+            )
+            for s in students
+            for day in range(2)
+        )
+        Result.objects.bulk_create(
+            Result(exam=exam, student=s, classroom=classroom, marks=30, total_marks=50, grade="B")
+            for s in students
+        )
+        # As after a bulk write; unranked results are ranked on first read.
+        refresh_exam_ranks([exam.pk])
+        meeting = Meeting.objects.create(
+            title="PTM", date=TODAY, time=datetime.time(10), classroom=classroom, location="Hall"
+        )
+        parent = students[0].parent
+        Notification.objects.bulk_create(
+            Notification(parent=parent, type="MEETING", title=f"N{i}", message="m") for i in range(size)
+        )
+        return {
+            "classroom": classroom,
+            "students": students,
+            "exam": exam,
+            "meeting": meeting,
+            "parent": parent,
+            "tag": tag,
+        }
+
+    def assertQueryBudget(self, budget, request_for, user=None):
+        captured = {}
+        for size in SIZES:
+            fixture = self.seed(size)
+            method, url, data = request_for(fixture)
+            # Authenticate as the API does in production, from a bearer token.
+            token = ClaimsTokenObtainPairSerializer.get_token(user(fixture) if user else self.admin)
+            self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+            with CaptureQueriesContext(connection) as ctx:
+                response = getattr(self.client, method)(url, data, format="json")
+            self.assertLess(response.status_code, 400, response.content)
+            captured[size] = [query["sql"] for query in ctx.captured_queries]
+
+        counts = {size: len(queries) for size, queries in captured.items()}
+        worst = max(captured, key=lambda size: len(captured[size]))
+        sql = "\n".join(captured[worst])
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f"Query count grows with rows {counts}; queries at size {worst}:\n{sql}",
+        )
+        self.assertLessEqual(
+            counts[worst], budget,
+            f"{counts[worst]} queries exceeds budget of {budget}:\n{sql}",
+        )
+
+    def test_me(self):
+        # The only route that loads the full user row.
+        self.assertQueryBudget(1, lambda f: ("get", reverse("me"), None))
+
+    def test_classrooms(self):
+        # One extra query reads the version counters behind the ETag.
+        self.assertQueryBudget(2, lambda f: ("get", reverse("classroom-list"), None))
+        self.assertQueryBudget(
+            1, lambda f: ("get", reverse("classroom-detail", args=[f["classroom"].pk]), None)
+        )
+
+    def test_students(self):
+        self.assertQueryBudget(2, lambda f: ("get", reverse("student-list"), None))
+        self.assertQueryBudget(
+            1, lambda f: ("get", reverse("student-detail", args=[f["students"][0].pk]), None)
+        )
+        # Writes include one UPDATE of the version counter.
+        self.assertQueryBudget(
+            4,
+            lambda f: (
+                "post",
+                reverse("student-list"),
+                {"name": "New", "roll_number": "999", "classroom_id": f["classroom"].pk},
+            ),
+        )
+
+    def test_exams(self):
+        self.assertQueryBudget(2, lambda f: ("get", reverse("exam-list"), None))
+        self.assertQueryBudget(
+            1, lambda f: ("get", reverse("exam-detail", args=[f["exam"].pk]), None)
+        )
+        self.assertQueryBudget(
+            4, lambda f: ("get", reverse("exam-stats", args=[f["exam"].pk]), None)
+        )
+
+    def test_meetings(self):
+        self.assertQueryBudget(2, lambda f: ("get", reverse("meeting-list"), None))
+        self.assertQueryBudget(
+            1, lambda f: ("get", reverse("meeting-detail", args=[f["meeting"].pk]), None)
+        )
+        self.assertQueryBudget(
+            6,
+            lambda f: (
+                "post",
+                reverse("meeting-list"),
+                {
+                    "title": "Open day",
+                    "date": TODAY.isoformat(),
+                    "time": "09:00",
+                    "classroom_id": f["classroom"].pk,
+                    "location": "Hall",
+                },
+            ),
+        )
+
+    def test_attendance(self):
+        self.assertQueryBudget(
+            1,
+            lambda f: ("get", reverse("attendance-by-class", args=[f["classroom"].pk]), None),
+        )
+        self.assertQueryBudget(
+            1,
+            lambda f: ("get", reverse("attendance-by-student", args=[f["students"][0].pk]), None),
+        )
+        self.assertQueryBudget(
+            11,
+            lambda f: (
+                "post",
+                reverse("attendance-bulk-create"),
+                [
+                    {"student_id": s.pk, "date": TODAY.isoformat(), "status": "ABSENT"}
+                    for s in f["students"]
+                ],
+            ),
+        )
+
+    def test_attendance_student_summary(self):
+        # Worst case: the rollup does not exist yet and is built on read.
+        self.assertQueryBudget(
+            6,
+            lambda f: (
+                "get",
+                reverse("attendance-student-summary", args=[f["students"][0].pk]),
+                None,
+            ),
+        )
+
+    def test_attendance_summary(self):
+        self.assertQueryBudget(
+            1, lambda f: ("get", reverse("attendance-summary") + f"?start={TODAY}&end={TODAY}", None)
+        )
+
+    def test_results(self):
+        self.assertQueryBudget(
+            1, lambda f: ("get", reverse("results-by-exam", args=[f["exam"].pk]), None)
+        )
+        self.assertQueryBudget(
+            1, lambda f: ("get", reverse("results-by-student", args=[f["students"][0].pk]), None)
+        )
+        self.assertQueryBudget(
+            10,
+            lambda f: (
+                "post",
+                reverse("results-bulk-create"),
+                [
+                    {
+                        "exam_id": f["exam"].pk,
+                        "student_id": s.pk,
+                        "marks": 40,
+                        "total_marks": 50,
+                        "grade": "A",
+                    }
+                    for s in f["students"]
+                ],
+            ),
+        )
+        self.assertQueryBudget(
+            3,
+            lambda f: ("get", reverse("results-student-rank", args=[f["students"][0].pk]), None),
+        )
+        self.assertQueryBudget(
+            2, lambda f: ("post", reverse("results-regrade", args=[f["exam"].pk]), None)
+        )
+
+    def test_notifications(self):
+        parent_user = lambda f: f["parent"].user  # noqa: E731
+        self.assertQueryBudget(
+            1, lambda f: ("get", reverse("notifications-list"), None), user=parent_user
+        )
+        self.assertQueryBudget(
+            5,
+            lambda f: (
+                "patch",
+                reverse(
+                    "notification-mark-read",
+                    args=[f["parent"].notifications.values_list("pk", flat=True).first()],
+                ),
+                None,
+            ),
+            user=parent_user,
+        )
+        self.assertQueryBudget(
+            1, lambda f: ("get", reverse("notifications-unread-count"), None), user=parent_user
+        )
+        self.assertQueryBudget(
+            1, lambda f: ("get", reverse("notifications-history"), None), user=parent_user
+        )
+        # Seeded children have no rollup yet, so this includes building it.
+        self.assertQueryBudget(
+            8, lambda f: ("get", reverse("parent-dashboard"), None), user=parent_user
+        )
+        self.assertQueryBudget(
+            6,
+            lambda f: (
+                "post",
+                reverse("notifications-mark-read"),
+                {"ids": list(f["parent"].notifications.values_list("pk", flat=True))},
+            ),
+            user=parent_user,
+        )
+        self.assertQueryBudget(
+            6, lambda f: ("post", reverse("notifications-mark-all-read"), None), user=parent_user
+        )
+
+    def test_parents(self):
+        self.assertQueryBudget(1, lambda f: ("get", reverse("parents-admin"), None))
+        with self.settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]):
+            # Creating the profile bumps the parent counter.
+            self.assertQueryBudget(
+                4,
+                lambda f: (
+                    "post",
+                    reverse("parents-admin"),
+                    {"username": f"new-{f['tag']}", "password": "pw-12345", "phone": "1"},
+                ),
+            )
+
+    def test_staff_users(self):
+        self.assertQueryBudget(1, lambda f: ("get", reverse("staff-users-admin"), None))
+        with self.settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]):
+            self.assertQueryBudget(
+                2,
+                lambda f: (
+                    "post",
+                    reverse("staff-users-admin"),
+                    {"username": f"staff-{f['tag']}", "password": "pw-12345", "role": "TEACHER"},
+                ),
+            )
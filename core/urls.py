@@ -5,16 +5,27 @@ from .views import (
     MeView,
     ClassRoomViewSet,
     StudentViewSet,
+    ImportView,
     AttendanceBulkCreateView,
     AttendanceByClassView,
     AttendanceByStudentView,
+    AttendanceSummaryView,
+    StudentAttendanceRollupView,
     ExamViewSet,
     ResultBulkCreateView,
     ResultByStudentView,
     ResultByExamView,
+    ResultRegradeView,
+    StudentRankView,
     MeetingViewSet,
+    ParentDashboardView,
     NotificationListView,
+    NotificationHistoryView,
     NotificationMarkReadView,
+    NotificationUnreadCountView,
+    NotificationBulkMarkReadView,
+    CacheStatsView,
+    WriteCoalescerStatsView,
 )
 from .parent_api import parent_admin_view
 from .staff_api import staff_user_view
@@ -30,14 +41,30 @@ router.register(r'meetings', MeetingViewSet, basename='meeting')
 urlpatterns = [
     path('me/', MeView.as_view(), name='me'),
     path('', include(router.urls)),
+    path('import/<str:kind>/', ImportView.as_view(), name='import'),
     path('attendance/bulk_create/', AttendanceBulkCreateView.as_view(), name='attendance-bulk-create'),
     path('attendance/class/<int:class_id>/', AttendanceByClassView.as_view(), name='attendance-by-class'),
     path('attendance/student/<int:student_id>/', AttendanceByStudentView.as_view(), name='attendance-by-student'),
+    path('attendance/student/<int:student_id>/summary/', StudentAttendanceRollupView.as_view(), name='attendance-student-summary'),
+    path('attendance/summary/', AttendanceSummaryView.as_view(), name='attendance-summary'),
     path('results/bulk_create/', ResultBulkCreateView.as_view(), name='results-bulk-create'),
     path('results/student/<int:student_id>/', ResultByStudentView.as_view(), name='results-by-student'),
+    path('results/student/<int:student_id>/rank/', StudentRankView.as_view(), name='results-student-rank'),
     path('results/exam/<int:exam_id>/', ResultByExamView.as_view(), name='results-by-exam'),
+    path('results/exam/<int:exam_id>/regrade/', ResultRegradeView.as_view(), name='results-regrade'),
+    path('parent/dashboard/', ParentDashboardView.as_view(), name='parent-dashboard'),
     path('notifications/', NotificationListView.as_view(), name='notifications-list'),
+    path('notifications/history/', NotificationHistoryView.as_view(), name='notifications-history'),
+    path('notifications/unread_count/', NotificationUnreadCountView.as_view(), name='notifications-unread-count'),
+    path('notifications/mark_read/', NotificationBulkMarkReadView.as_view(), name='notifications-mark-read'),
+    path(
+        'notifications/mark_all_read/',
+        NotificationBulkMarkReadView.as_view(mark_all=True),
+        name='notifications-mark-all-read',
+    ),
     path('notifications/<int:notification_id>/mark_read/', NotificationMarkReadView.as_view(), name='notification-mark-read'),
+    path('cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
+    path('writes/stats/', WriteCoalescerStatsView.as_view(), name='write-coalescer-stats'),
     path('parents/', parent_admin_view, name='parents-admin'),
     path('staff-users/', staff_user_view, name='staff-users-admin'),
 ]
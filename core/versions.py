@@ -0,0 +1,78 @@
+import hashlib
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .models import ResourceVersion
+
+
+CLASSROOMS = "classroom"
+STUDENTS = "student"
+PARENTS = "parent"
+EXAMS = "exam"
+MEETINGS = "meeting"
+
+
+def bump(*keys):
+    """Record a write to the resources ``keys``; one ``UPDATE`` per key.
+
+    Call this from any code path that changes these tables without going
+    through ``Model.save``/``delete`` (``QuerySet.update``, ``bulk_create``),
+    since the signal handlers only see model-level writes.
+    """
+    now = timezone.now()
+    for key in keys:
+        updated = ResourceVersion.objects.filter(key=key).update(version=F("version") + 1, updated_at=now)
+        if not updated:
+            # Counters are created by the migration; this covers new keys.
+            ResourceVersion.objects.get_or_create(key=key, defaults={"version": 1, "updated_at": now})
+
+
+def validators(keys, vary=""):
+    """``(etag, last_modified)`` for a response built from ``keys``, in one query.
+
+    ``vary`` is folded into the ETag for anything else the response depends
+    on, such as the query string.
+    """
+    rows = {
+        key: (version, updated_at)
+        for key, version, updated_at in ResourceVersion.objects.filter(key__in=keys).values_list(
+            "key", "version", "updated_at"
+        )
+    }
+    state = ";".join(f"{key}={rows[key][0] if key in rows else 0}" for key in sorted(keys))
+    etag = quote_etag(hashlib.md5(f"{state}|{vary}".encode(), usedforsecurity=False).hexdigest())
+    stamps = [updated_at for _version, updated_at in rows.values()]
+    return etag, max(stamps) if stamps else None
+
+
+class ConditionalListMixin:
+    """Answer ``If-None-Match``/``If-Modified-Since`` on list requests with a 304.
+
+    ``version_keys`` names the resources whose counters the listing depends
+    on, including those of nested objects. The check runs before the list
+    query or serializer, so a revalidation costs one query.
+    """
+
+    version_keys = ()
+
+    def list(self, request, *args, **kwargs):
+        # The query string selects the page and shape, so it is part of the tag.
+        etag, last_modified = validators(self.version_keys, vary=request.get_full_path())
+        # Whole seconds, as HTTP dates carry no fraction.
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = self.get_list_response(request, etag, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response.headers["ETag"] = etag
+            if timestamp is not None:
+                response.headers["Last-Modified"] = http_date(timestamp)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_list_response(self, request, etag, *args, **kwargs):
+        """Build the full listing; ``etag`` identifies its current content."""
+        return super().list(request, *args, **kwargs)
@@ -1,32 +1,65 @@
+from collections import defaultdict
+
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Subquery, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework import generics, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 
 from .models import (
     ClassRoom,
     ParentProfile,
     Student,
+    StudentAttendanceRollup,
     Attendance,
+    ClassAttendanceSummary,
     Exam,
+    ExamRank,
     Result,
     Meeting,
+    ArchivedNotification,
     Notification,
+    NotificationOutbox,
 )
+from .auth import ClaimsUser, parent_profile_id_for
+from .bulk import move_student_records, regrade_exam, upsert_attendance, upsert_results
+from .coalescer import attendance_writes, coalescer_stats, reset_coalescer_stats, result_writes
+from .imports import IMPORTERS, ImportFileError, import_file
+from .notifications import mark_all_read, mark_read
+from .outbox import enqueue
+from .pagination import RequiredKeysetPagination
 from .permissions import IsAdminOrPrincipal, IsTeacherOrStaff, IsParent
+from .ranking import refresh_exam_ranks, term_ranks
+from .response_cache import CachedListMixin, cache_stats, reset_cache_stats
+from .rollups import current_term_start, refresh_class_summaries, refresh_student_rollups
+from .shapes import FlatShapeMixin
+from .stats import get_exam_stats, invalidate_exam_stats
+from .versions import CLASSROOMS, EXAMS, MEETINGS, PARENTS, STUDENTS, ConditionalListMixin
 from .serializers import (
     UserSerializer,
     ClassRoomSerializer,
     StudentSerializer,
     AttendanceSerializer,
+    AttendanceFlatSerializer,
     AttendanceBulkCreateSerializer,
+    ClassAttendanceSummarySerializer,
+    DashboardChildSerializer,
+    StudentAttendanceRollupSerializer,
     ExamSerializer,
+    ExamRankSerializer,
     ResultSerializer,
+    ResultFlatSerializer,
     ResultBulkCreateSerializer,
     MeetingSerializer,
     NotificationSerializer,
+    ArchivedNotificationSerializer,
+    NotificationIdsSerializer,
 )
 
 
@@ -37,21 +70,26 @@ class MeView(generics.RetrieveAPIView):
     serializer_class = UserSerializer
 
     def get_object(self):
-        return self.request.user
+        user = self.request.user
+        # Token users carry only claims; the profile needs the full row.
+        return user.user if isinstance(user, ClaimsUser) else user
 
 
-class ClassRoomViewSet(viewsets.ModelViewSet):
+class ClassRoomViewSet(CachedListMixin, viewsets.ModelViewSet):
     queryset = ClassRoom.objects.all().order_by("name", "section")
     serializer_class = ClassRoomSerializer
+    version_keys = (CLASSROOMS,)
+    cache_name = "classrooms"
     def get_permissions(self):
         if self.request.method in permissions.SAFE_METHODS:
             return [permissions.IsAuthenticated()]
         return [IsAdminOrPrincipal()]
 
 
-class StudentViewSet(viewsets.ModelViewSet):
-    queryset = Student.objects.select_related("classroom", "parent").all()
+class StudentViewSet(ConditionalListMixin, viewsets.ModelViewSet):
+    queryset = Student.objects.select_related("classroom", "parent__user").all()
     serializer_class = StudentSerializer
+    version_keys = (STUDENTS, CLASSROOMS, PARENTS)
     def get_permissions(self):
         # Allow any authenticated user (including parents) to view students,
         # but only admin/principal can modify.
@@ -59,154 +97,307 @@ class StudentViewSet(viewsets.ModelViewSet):
             return [permissions.IsAuthenticated()]
         return [IsAdminOrPrincipal()]
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        previous_classroom_id = serializer.instance.classroom_id
+        student = serializer.save()
+        move_student_records(student, previous_classroom_id)
+
+
+class ImportView(generics.GenericAPIView):
+    """Import students or parents from an uploaded CSV/XLSX ``file``.
+
+    Rows that fail validation are listed in the response and skipped; the
+    rest of the file is still imported.
+    """
+
+    parser_classes = [MultiPartParser]
+    permission_classes = [IsAdminOrPrincipal]
+
+    def post(self, request, kind, *args, **kwargs):
+        if kind not in IMPORTERS:
+            raise NotFound()
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": ["Upload a .csv or .xlsx file."]})
+        try:
+            # Passwords are hashed in this process: forking a pool from a
+            # request thread is unsafe. Use import_records for large files.
+            report = import_file(kind, upload, upload.name)
+        except ImportFileError as exc:
+            raise ValidationError({"file": [str(exc)]})
+        return Response(report, status=status.HTTP_201_CREATED if report["created"] else status.HTTP_200_OK)
+
 
 class AttendanceBulkCreateView(generics.GenericAPIView):
     serializer_class = AttendanceBulkCreateSerializer
     permission_classes = [IsTeacherOrStaff]
 
-    @transaction.atomic
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data, many=True)
         serializer.is_valid(raise_exception=True)
-        records = []
-        notifications = []
-        for item in serializer.validated_data:
-            student = item["student"]
-            date = item["date"]
-            status_value = item["status"]
-            attendance, _created = Attendance.objects.update_or_create(
-                student=student,
-                date=date,
-                defaults={"status": status_value, "marked_by": request.user},
-            )
-            records.append(attendance)
-
-            if (
-                status_value == Attendance.Status.ABSENT
-                and student.parent is not None
-            ):
-                notifications.append(
-                    Notification(
-                        parent=student.parent,
-                        type=Notification.Types.ATTENDANCE,
-                        title="Attendance Alert",
-                        message=f"{student.name} is absent on {date}.",
-                    )
-                )
-
-        if notifications:
-            Notification.objects.bulk_create(notifications)
-
+        records = attendance_writes.submit(
+            lambda: self.save_attendance(serializer.validated_data, request.user.pk)
+        )
         return Response(
             AttendanceSerializer(records, many=True).data,
             status=status.HTTP_201_CREATED,
         )
 
+    @staticmethod
+    def save_attendance(items, marked_by_id):
+        # Runs inside the coalescer's transaction, possibly on another
+        # request's thread.
+        records = upsert_attendance(items, marked_by_id)
+        refresh_class_summaries({(record.classroom_id, record.date) for record in records})
+        refresh_student_rollups({record.student_id for record in records})
+
+        absent_ids = sorted(
+            {
+                record.pk
+                for record in records
+                if record.status == Attendance.Status.ABSENT and record.student.parent_id is not None
+            }
+        )
+        if absent_ids:
+            enqueue(NotificationOutbox.Kinds.ATTENDANCE, {"attendance_ids": absent_ids})
+        return records
+
+
+ATTENDANCE_FLAT_FIELDS = ("id", "student_id", "date", "status", "marked_by_id", "created_at")
+RESULT_FLAT_FIELDS = (
+    "id",
+    "exam_id",
+    "student_id",
+    "marks",
+    "total_marks",
+    "grade",
+    "remarks",
+    "created_by_id",
+    "created_at",
+)
+
 
-class AttendanceByClassView(generics.ListAPIView):
+class AttendanceByClassView(FlatShapeMixin, generics.ListAPIView):
     serializer_class = AttendanceSerializer
+    flat_serializer_class = AttendanceFlatSerializer
+    flat_fields = ATTENDANCE_FLAT_FIELDS
     permission_classes = [IsTeacherOrStaff | IsAdminOrPrincipal]
+    keyset_ordering = ("-date", "student__roll_number")
 
     def get_queryset(self):
         class_id = self.kwargs["class_id"]
         date_param = self.request.query_params.get("date")
-        qs = Attendance.objects.select_related("student", "student__classroom").filter(
-            student__classroom_id=class_id
-        )
+        qs = Attendance.objects.select_related(
+            "student", "student__classroom", "student__parent__user"
+        ).filter(classroom_id=class_id)
         if date_param:
             qs = qs.filter(date=date_param)
         return qs
 
 
-class AttendanceByStudentView(generics.ListAPIView):
+class AttendanceByStudentView(FlatShapeMixin, generics.ListAPIView):
     serializer_class = AttendanceSerializer
+    flat_serializer_class = AttendanceFlatSerializer
+    flat_fields = ATTENDANCE_FLAT_FIELDS
     permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = ("-date",)
 
     def get_queryset(self):
         student_id = self.kwargs["student_id"]
-        qs = Attendance.objects.select_related("student", "student__classroom").filter(
-            student_id=student_id
-        )
+        qs = Attendance.objects.select_related(
+            "student", "student__classroom", "student__parent__user"
+        ).filter(student_id=student_id)
         return qs
 
 
-class ExamViewSet(viewsets.ModelViewSet):
+class StudentAttendanceRollupView(generics.RetrieveAPIView):
+    """Term-to-date attendance counts and current absence streak for a student."""
+
+    serializer_class = StudentAttendanceRollupSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_object(self):
+        student_id = self.kwargs["student_id"]
+        rollup = StudentAttendanceRollup.objects.filter(student_id=student_id).first()
+        if rollup is None or rollup.term_start != current_term_start():
+            # First read for this student, or the term rolled over since the
+            # last attendance write.
+            if not Student.objects.filter(pk=student_id).exists():
+                raise NotFound("Student not found.")
+            refresh_student_rollups([student_id])
+            rollup = StudentAttendanceRollup.objects.get(student_id=student_id)
+        return rollup
+
+
+class AttendanceSummaryView(generics.ListAPIView):
+    """Daily present/absent/late counts for every classroom.
+
+    ``?start=`` and ``?end=`` (YYYY-MM-DD) bound the date range; both
+    default to today.
+    """
+
+    serializer_class = ClassAttendanceSummarySerializer
+    permission_classes = [IsTeacherOrStaff | IsAdminOrPrincipal]
+    keyset_ordering = ("date", "classroom_id")
+
+    def get_queryset(self):
+        today = timezone.localdate()
+        bounds = {}
+        for name in ("start", "end"):
+            value = self.request.query_params.get(name)
+            bounds[name] = parse_date(value) if value else today
+            if bounds[name] is None:
+                raise ValidationError({name: ["Date has wrong format. Use YYYY-MM-DD."]})
+        return ClassAttendanceSummary.objects.filter(
+            date__gte=bounds["start"], date__lte=bounds["end"]
+        ).order_by("date", "classroom_id")
+
+
+class ExamViewSet(CachedListMixin, viewsets.ModelViewSet):
     queryset = Exam.objects.select_related("classroom").all()
     serializer_class = ExamSerializer
+    version_keys = (EXAMS, CLASSROOMS)
+    cache_name = "exams"
     permission_classes = [IsTeacherOrStaff | IsAdminOrPrincipal]
 
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        exam = self.get_object()
+        return Response(get_exam_stats(exam.pk))
+
 
 class ResultBulkCreateView(generics.GenericAPIView):
+    """Create or update results in bulk.
+
+    Pass ``?grading=auto`` to have grades computed from the marks with the
+    configured grading scale; the ``grade`` field is then optional and ignored.
+    """
+
     serializer_class = ResultBulkCreateSerializer
     permission_classes = [IsTeacherOrStaff | IsAdminOrPrincipal]
 
-    @transaction.atomic
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["auto_grade"] = self.request.query_params.get("grading") == "auto"
+        return context
+
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data, many=True)
         serializer.is_valid(raise_exception=True)
-        results = []
-        notifications = []
-        for item in serializer.validated_data:
-            exam = item["exam"]
-            student = item["student"]
-            result, _created = Result.objects.update_or_create(
-                exam=exam,
-                student=student,
-                defaults={
-                    "marks": item["marks"],
-                    "total_marks": item["total_marks"],
-                    "grade": item["grade"],
-                    "remarks": item.get("remarks", ""),
-                    "created_by": request.user,
-                },
+        results = result_writes.submit(
+            lambda: self.save_results(
+                serializer.validated_data, request.user.pk, serializer.context["auto_grade"]
             )
-            results.append(result)
-
-            if student.parent is not None:
-                notifications.append(
-                    Notification(
-                        parent=student.parent,
-                        type=Notification.Types.EXAM_RESULT,
-                        title=f"Exam Result: {exam.name}",
-                        message=(
-                            f"{student.name}'s result for {exam.subject}: "
-                            f"{result.marks}/{result.total_marks} (Grade {result.grade})."
-                        ),
-                    )
-                )
-
-        if notifications:
-            Notification.objects.bulk_create(notifications)
-
+        )
         return Response(
             ResultSerializer(results, many=True).data,
             status=status.HTTP_201_CREATED,
         )
 
+    @staticmethod
+    def save_results(items, created_by_id, auto_grade):
+        # Runs inside the coalescer's transaction, like save_attendance.
+        results = upsert_results(items, created_by_id, auto_grade=auto_grade)
+        exam_ids = {result.exam_id for result in results}
+        refresh_exam_ranks(exam_ids)
+        invalidate_exam_stats(exam_ids)
+
+        result_ids = sorted({result.pk for result in results if result.student.parent_id is not None})
+        if result_ids:
+            enqueue(NotificationOutbox.Kinds.EXAM_RESULT, {"result_ids": result_ids})
+        return results
+
+
+class ResultRegradeView(generics.GenericAPIView):
+    """Re-grade every result of an exam with the current grading scale."""
+
+    permission_classes = [IsTeacherOrStaff | IsAdminOrPrincipal]
+
+    def post(self, request, exam_id, *args, **kwargs):
+        if not Exam.objects.filter(pk=exam_id).exists():
+            return Response({"detail": "Exam not found."}, status=status.HTTP_404_NOT_FOUND)
+        updated = regrade_exam(exam_id)
+        invalidate_exam_stats([exam_id])
+        return Response({"exam_id": exam_id, "updated": updated})
+
 
-class ResultByStudentView(generics.ListAPIView):
+class ResultByStudentView(FlatShapeMixin, generics.ListAPIView):
     serializer_class = ResultSerializer
+    flat_serializer_class = ResultFlatSerializer
+    flat_fields = RESULT_FLAT_FIELDS
     permission_classes = [permissions.IsAuthenticated]
+    keyset_ordering = ("exam_id",)
 
     def get_queryset(self):
         student_id = self.kwargs["student_id"]
-        return Result.objects.select_related("exam", "student").filter(student_id=student_id)
+        return Result.objects.select_related(
+            "exam", "exam__classroom", "student", "student__classroom", "student__parent__user"
+        ).filter(student_id=student_id)
+
+
+class StudentRankView(generics.GenericAPIView):
+    """A student's class rank for each exam and across the current term.
+
+    Per-exam ranks are read from the materialized ``ExamRank`` table; pass
+    ``?exam=<id>`` to fetch a single exam's rank. Exams whose results
+    predate the table (or were written without going through the bulk
+    endpoint) are ranked on first read.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, student_id, *args, **kwargs):
+        ranked = ExamRank.objects.filter(exam_id=OuterRef("exam_id"), student_id=OuterRef("student_id"))
+        unranked = Result.objects.filter(student_id=OuterRef("pk")).filter(~Exists(ranked))
+        student = (
+            Student.objects.only("classroom_id").annotate(unranked=Exists(unranked)).filter(pk=student_id).first()
+        )
+        if student is None:
+            raise NotFound("Student not found.")
+        if student.unranked:
+            refresh_exam_ranks(
+                Result.objects.filter(student_id=student_id)
+                .filter(~Exists(ranked))
+                .values_list("exam_id", flat=True)
+            )
+        ranks = ExamRank.objects.filter(student_id=student_id)
+        exam_param = request.query_params.get("exam")
+        if exam_param:
+            if not exam_param.isdigit():
+                raise ValidationError({"exam": ["A valid integer is required."]})
+            ranks = ranks.filter(exam_id=exam_param)
+        term_start = current_term_start()
+        return Response(
+            {
+                "student_id": student.pk,
+                "exams": ExamRankSerializer(ranks, many=True).data,
+                "term_start": term_start,
+                "term": term_ranks(student.classroom_id, term_start).get(student.pk),
+            }
+        )
 
 
-class ResultByExamView(generics.ListAPIView):
+class ResultByExamView(FlatShapeMixin, generics.ListAPIView):
     serializer_class = ResultSerializer
+    flat_serializer_class = ResultFlatSerializer
+    flat_fields = RESULT_FLAT_FIELDS
     permission_classes = [IsTeacherOrStaff | IsAdminOrPrincipal]
+    keyset_ordering = ("student_id",)
 
     def get_queryset(self):
         exam_id = self.kwargs["exam_id"]
-        return Result.objects.select_related("exam", "student", "student__classroom").filter(
-            exam_id=exam_id
-        )
+        return Result.objects.select_related(
+            "exam", "exam__classroom", "student", "student__classroom", "student__parent__user"
+        ).filter(exam_id=exam_id)
 
 
-class MeetingViewSet(viewsets.ModelViewSet):
+class MeetingViewSet(CachedListMixin, viewsets.ModelViewSet):
     queryset = Meeting.objects.select_related("classroom").all()
     serializer_class = MeetingSerializer
+    version_keys = (MEETINGS, CLASSROOMS)
+    cache_name = "meetings"
+    keyset_ordering = ("-date", "-id")
 
     def get_permissions(self):
         if self.action in ["create", "update", "partial_update", "destroy"]:
@@ -215,36 +406,107 @@ class MeetingViewSet(viewsets.ModelViewSet):
 
     @transaction.atomic
     def perform_create(self, serializer):
-        meeting = serializer.save(created_by=self.request.user)
-        students = Student.objects.filter(classroom=meeting.classroom).select_related("parent")
-        notifications = []
-        for student in students:
-            if student.parent is None:
-                continue
-            notifications.append(
-                Notification(
-                    parent=student.parent,
-                    type=Notification.Types.MEETING,
-                    title=f"Parent Meeting: {meeting.title}",
-                    message=(
-                        f"Meeting scheduled on {meeting.date} at {meeting.time} "
-                        f"for class {meeting.classroom}. Location: {meeting.location}."
-                    ),
+        meeting = serializer.save(created_by_id=self.request.user.pk)
+        enqueue(NotificationOutbox.Kinds.MEETING, {"meeting_id": meeting.pk})
+
+
+DASHBOARD_RECENT_RESULTS = 5
+DASHBOARD_RECENT_NOTIFICATIONS = 5
+
+
+class ParentDashboardView(generics.GenericAPIView):
+    """Everything the parent home page shows, in one response.
+
+    Children with their latest attendance mark, term rollup and most recent
+    results, plus the unread count and latest notifications. Costs four
+    queries however many children there are (three more the first time a
+    child's rollup is built or after the term rolls over).
+    """
+
+    permission_classes = [IsParent]
+
+    def get(self, request, *args, **kwargs):
+        parent = ParentProfile.objects.filter(user_id=request.user.pk).first()
+        if parent is None:
+            return Response(
+                {"parent_id": None, "unread_notifications": 0, "children": [], "recent_notifications": []}
+            )
+
+        latest = Attendance.objects.filter(student_id=OuterRef("pk")).order_by("-date")
+        children = list(
+            Student.objects.filter(parent_id=parent.pk)
+            .select_related("classroom", "attendance_rollup")
+            .annotate(
+                latest_attendance_date=Subquery(latest.values("date")[:1]),
+                latest_attendance_status=Subquery(latest.values("status")[:1]),
+            )
+            .order_by("name", "pk")
+        )
+
+        term_start = current_term_start()
+        stale = [
+            child.pk
+            for child in children
+            if getattr(child, "attendance_rollup", None) is None
+            or child.attendance_rollup.term_start != term_start
+        ]
+        if stale:
+            refresh_student_rollups(stale, term_start)
+            rollups = StudentAttendanceRollup.objects.in_bulk(stale)
+            for child in children:
+                if child.pk in rollups:
+                    child.attendance_rollup = rollups[child.pk]
+
+        recent = defaultdict(list)
+        results = (
+            Result.objects.filter(student_id__in=[child.pk for child in children])
+            .select_related("exam")
+            .annotate(
+                position=Window(
+                    RowNumber(), partition_by=F("student_id"), order_by=[F("created_at").desc(), F("id").desc()]
                 )
             )
-        if notifications:
-            Notification.objects.bulk_create(notifications)
+            .filter(position__lte=DASHBOARD_RECENT_RESULTS)
+            .order_by("student_id", "position")
+        )
+        for result in results:
+            recent[result.student_id].append(result)
+        for child in children:
+            child.recent_results = recent[child.pk]
+
+        notifications = parent.notifications.order_by("-date", "-id")[:DASHBOARD_RECENT_NOTIFICATIONS]
+        return Response(
+            {
+                "parent_id": parent.pk,
+                "unread_notifications": parent.unread_notifications,
+                "children": DashboardChildSerializer(children, many=True).data,
+                "recent_notifications": NotificationSerializer(notifications, many=True).data,
+            }
+        )
 
 
 class NotificationListView(generics.ListAPIView):
     serializer_class = NotificationSerializer
     permission_classes = [IsParent]
+    keyset_ordering = ("-date", "-id")
 
     def get_queryset(self):
-        parent_profile = getattr(self.request.user, "parent_profile", None)
-        if not parent_profile:
+        parent_id = parent_profile_id_for(self.request.user)
+        if parent_id is None:
             return Notification.objects.none()
-        return Notification.objects.filter(parent=parent_profile)
+        return Notification.objects.filter(parent_id=parent_id)
+
+
+class NotificationHistoryView(generics.ListAPIView):
+    """Archived (read, older) notifications, newest first, always paginated."""
+
+    serializer_class = ArchivedNotificationSerializer
+    permission_classes = [IsParent]
+    pagination_class = RequiredKeysetPagination
+    keyset_ordering = ("-date", "-id")
+
+    def get_queryset(self):
+        return ArchivedNotification.objects.filter(parent__user_id=self.request.user.pk)
 
 
 class NotificationMarkReadView(generics.UpdateAPIView):
@@ -253,14 +515,74 @@ class NotificationMarkReadView(generics.UpdateAPIView):
     lookup_url_kwarg = "notification_id"
 
     def get_queryset(self):
-        parent_profile = getattr(self.request.user, "parent_profile", None)
-        if not parent_profile:
+        parent_id = parent_profile_id_for(self.request.user)
+        if parent_id is None:
             return Notification.objects.none()
-        return Notification.objects.filter(parent=parent_profile)
+        return Notification.objects.filter(parent_id=parent_id)
 
     def patch(self, request, *args, **kwargs):
         instance = self.get_object()
+        mark_read(instance.parent_id, [instance.pk])
         instance.is_read = True
-        instance.save(update_fields=["is_read"])
         return Response(self.get_serializer(instance).data)
 
+
+class NotificationUnreadCountView(generics.GenericAPIView):
+    """Unread badge count, read from the parent's maintained counter."""
+
+    permission_classes = [IsParent]
+
+    def get(self, request, *args, **kwargs):
+        unread = (
+            ParentProfile.objects.filter(user_id=request.user.pk)
+            .values_list("unread_notifications", flat=True)
+            .first()
+        )
+        return Response({"unread": unread or 0})
+
+
+class NotificationBulkMarkReadView(generics.GenericAPIView):
+    """Mark several notifications as read (``{"ids": [...]}``), or all of them."""
+
+    serializer_class = NotificationIdsSerializer
+    permission_classes = [IsParent]
+    mark_all = False
+
+    def post(self, request, *args, **kwargs):
+        parent_id = parent_profile_id_for(request.user)
+        if parent_id is None:
+            return Response({"updated": 0, "unread": 0})
+        if self.mark_all:
+            updated = mark_all_read(parent_id)
+        else:
+            serializer = self.get_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            updated = mark_read(parent_id, serializer.validated_data["ids"])
+        unread = ParentProfile.objects.filter(pk=parent_id).values_list("unread_notifications", flat=True).get()
+        return Response({"updated": updated, "unread": unread})
+
+
+class CacheStatsView(generics.GenericAPIView):
+    """Hit/miss counters of the cached listings; ``DELETE`` resets them."""
+
+    permission_classes = [IsAdminOrPrincipal]
+
+    def get(self, request, *args, **kwargs):
+        return Response(cache_stats())
+
+    def delete(self, request, *args, **kwargs):
+        reset_cache_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class WriteCoalescerStatsView(generics.GenericAPIView):
+    """Batch sizes and wait times of this process's write coalescers; ``DELETE`` resets them."""
+
+    permission_classes = [IsAdminOrPrincipal]
+
+    def get(self, request, *args, **kwargs):
+        return Response(coalescer_stats())
+
+    def delete(self, request, *args, **kwargs):
+        reset_coalescer_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)